@@ -0,0 +1,341 @@
+"""Headless throughput benchmark for the complaint filing pipeline.
+
+Simulated users file complaints through the same building blocks the Streamlit pages use -
+question text from the translation cache, command matching and answer extraction, ticket
+creation and storage, PDF rendering - without a browser. The chatbot flow can also dictate an
+answer through speech.transcribe_file. Gemini and speech recognition are replaced by the
+in-process fakes (CYBERGUARD_LLM=fake, CYBERGUARD_SPEECH_BACKEND=stub) with configurable
+injected latency, and all stores and caches live in a temporary directory.
+
+    python benchmark.py --users 1 10 100 --llm-latency 0.2 --output bench.json
+
+Prints (or writes) one JSON document with complaints/sec, p50/p99 latency per complaint and per
+stage, and peak traced memory for each concurrency level, so runs can be diffed across releases.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import random
+import struct
+import tempfile
+import threading
+import time
+import tracemalloc
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+# Answers a user types for each chatbot question; free text gets a per-complaint suffix so
+# answers don't all hit the translation cache.
+SAMPLE_ANSWERS = {
+    "incident_datetime": "12/03/2024 around 4 pm",
+    "reason_delay": "I did not know where to report it",
+    "state_ut": "Karnataka",
+    "district": "Bengaluru Urban",
+    "police_station": "Koramangala",
+    "incident_location": "WhatsApp",
+    "incident_details": ("I received a call from someone claiming to be from my bank who asked me to share the OTP "
+                         "sent to my phone to stop my card being blocked. After I shared it, money was debited from "
+                         "my account in two transactions within a few minutes."),
+    "suspect_info_type": "Mobile Number",
+    "suspect_info_value": "98450 12345",
+    "suspect_additional_info": "He said his name was Rahul and spoke Hindi",
+    "name": "Test User",
+    "phone": "+91 98765 43210",
+    "email": "test.user@example.com",
+    "address": "12 MG Road, Bengaluru",
+    "id_type": "My ID is a Passport",
+    "id_number": "P1234567",
+    "bank_wallet_merchant": "State Bank of India",
+    "transaction_id": "412345678901",
+    "transaction_date": "12/03/2024",
+    "fraud_amount": "Rs. 25,000",
+    "suspect_website_social": "http://secure-kyc-update.example.com",
+    "suspect_mobile": "98450 12345",
+    "suspect_email": "kyc.update@example.com",
+    "suspect_bank_account": "123456789012",
+    "suspect_address": "Not known"
+}
+FREE_TEXT_FIELDS = {"reason_delay", "incident_details", "suspect_additional_info", "address", "suspect_address"}
+DICTATED_FIELD = "incident_details"
+
+
+def answers_for(n):
+    return {field: f"{text} (case {n})" if field in FREE_TEXT_FIELDS else text for field, text in SAMPLE_ANSWERS.items()}
+
+
+def dictation_wav(seed, seconds=(1.0, 0.8), rate=16000):
+    """A short WAV of tone bursts separated by silence, unique per seed so transcripts aren't cached."""
+    rng = random.Random(seed)
+    frames = bytearray()
+    for burst in seconds:
+        for i in range(int(burst * rate)):
+            frames += struct.pack("<h", int(3000 * math.sin(2 * math.pi * 440 * i / rate)))
+        for _ in range(int(0.7 * rate)):
+            frames += struct.pack("<h", rng.randint(-20, 20))
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        out.writeframes(bytes(frames))
+    buffer.seek(0)
+    return buffer
+
+
+class Pipeline:
+    """The app's filing steps, imported after the fake backends are configured."""
+
+    def __init__(self, voice):
+        import complaint_pdf
+        import complaint_store
+        import evidence_store
+        import extraction
+        import instrumentation
+        from commands import match_command
+        from extraction import extract_answer
+        from llm import get_client
+        from form_schema import plan
+        from portal_data import complaint_categories
+        from translation import translate_batch
+
+        self.pdf = complaint_pdf
+        self.store = complaint_store.store
+        self.new_ticket = complaint_store.new_ticket
+        self.evidence = evidence_store.store
+        self.instrumentation = instrumentation
+        self.match_command = match_command
+        self.extraction = extraction
+        self.extract_answer = extract_answer
+        self.client = get_client()
+        self.plan = plan
+        self.categories = complaint_categories
+        self.translate_batch = translate_batch
+        self.speech = None
+        if voice:
+            import speech
+            self.speech = speech
+
+    def counters(self):
+        """Cumulative model-call, local-parser and transcript-cache counters."""
+        transcripts = self.speech.transcripts.stats() if self.speech else {}
+        return {
+            "upstream": self.client.upstream_calls,
+            "coalesced": self.client.coalesced_calls,
+            "local": self.extraction.stats["local"],
+            "fallback": self.extraction.stats["fallback"],
+            "transcript_hits": transcripts.get("hits", 0),
+            "transcript_misses": transcripts.get("misses", 0)
+        }
+
+    def save(self, data, translated_data):
+        """save_to_db followed by the PDF render it queues, done inline so it is measured."""
+        with self.instrumentation.span("save_to_db"):
+            ticket = self.new_ticket(data, translated_data)
+            self.store.save(ticket)
+        self.pdf.generate_complaint_pdf(self.pdf.ticket_pdf_data(ticket))
+        return ticket.ticket_id
+
+    def chatbot(self, n, lang, category, language_code):
+        span = self.instrumentation.span
+        answers = answers_for(n)
+        form_data, translated = {}, {}
+        with span("form_plan"):
+            questions = self.plan(category, lang).fields
+        for question in questions:
+            field = question.field
+            user_input = answers[field]
+            if self.speech and field == DICTATED_FIELD:
+                with span("transcribe_audio_file"):
+                    user_input = self.speech.transcribe_file(dictation_wav(n), language_code)
+            with span("process_chatbot_input"):
+                if self.match_command(user_input, lang) is None:
+                    answer = self.extract_answer(field, user_input, lang)
+                    form_data[field] = answer["value"]
+                    translated[field] = answer["english"]
+        sub_category = self.categories[category][0]
+        for data in (form_data, translated):
+            data.update({"category": category, "sub_category": sub_category})
+        return self.save(form_data, translated)
+
+    def manual(self, n, lang, category):
+        answers = answers_for(n)
+        fields = self.plan(category, lang).field_names
+        data = {"category": category, "sub_category": self.categories[category][0]}
+        data.update((field, answers[field]) for field in fields)
+        evidence = [(io.BytesIO(f"screenshot {n}-{i}".encode() * 4096), f"screenshot_{i}.png") for i in range(2)]
+        refs = self.evidence.put_many(evidence)
+        with self.instrumentation.span("translate_batch"):
+            translated = self.translate_batch(data, lang, "English")
+        data["evidence_files"] = refs
+        return self.save(data, translated)
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def summarize(samples):
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 0.5) * 1000, 2),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+        "max_ms": round(max(samples, default=0.0) * 1000, 2)
+    }
+
+
+def ratio(hits, misses):
+    return round(hits / (hits + misses), 3) if hits + misses else None
+
+
+def run_level(pipeline, users, complaints_per_user, languages, seed, trace_memory):
+    """Run `users` concurrent simulated users, each filing complaints_per_user complaints."""
+    latencies = {"chatbot": [], "manual": []}
+    failures = []
+    lock = threading.Lock()
+    before = pipeline.counters()
+    pipeline.instrumentation.snapshot(reset=True)
+
+    def simulate(user):
+        rng = random.Random(f"{seed}:{users}:{user}")
+        for i in range(complaints_per_user):
+            n = f"{users}-{user}-{i}"
+            lang = rng.choice(list(languages))
+            category = rng.choice(list(pipeline.categories))
+            flow = rng.choice(["chatbot", "manual"])
+            started = time.perf_counter()
+            try:
+                if flow == "chatbot":
+                    pipeline.chatbot(n, lang, category, languages[lang])
+                else:
+                    pipeline.manual(n, lang, category)
+            except Exception as e:
+                with lock:
+                    failures.append(f"{flow}/{lang}/{category}: {e!r}")
+                continue
+            with lock:
+                latencies[flow].append(time.perf_counter() - started)
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(users) as pool:
+        list(pool.map(simulate, range(users)))
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    filed = latencies["chatbot"] + latencies["manual"]
+    counters = {name: value - before[name] for name, value in pipeline.counters().items()}
+    stages = {name: dict(summarize(recent), calls=count, errors=errors)
+              for name, (count, errors, recent) in sorted(pipeline.instrumentation.snapshot().items())}
+    return {
+        "users": users,
+        "complaints": len(filed),
+        "failures": len(failures),
+        "failure_samples": failures[:5],
+        "elapsed_s": round(elapsed, 3),
+        "complaints_per_sec": round(len(filed) / elapsed, 2) if elapsed else None,
+        "latency": summarize(filed),
+        "by_flow": {flow: summarize(samples) for flow, samples in latencies.items()},
+        "stages": stages,
+        "llm_upstream_calls": counters["upstream"],
+        "llm_coalesced_calls": counters["coalesced"],
+        "local_parser": {
+            "local": counters["local"],
+            "fallback": counters["fallback"],
+            "hit_rate": ratio(counters["local"], counters["fallback"])
+        },
+        "transcript_cache": {
+            "hits": counters["transcript_hits"],
+            "misses": counters["transcript_misses"],
+            "hit_rate": ratio(counters["transcript_hits"], counters["transcript_misses"])
+        },
+        "peak_traced_memory_mb": round(peak / (1024 * 1024), 2) if peak is not None else None
+    }
+
+
+def configure_environment(workdir, args):
+    """Point every backend and store at fakes and temp files. Must run before the app modules are imported."""
+    os.environ.update({
+        "CYBERGUARD_LLM": "fake",
+        "CYBERGUARD_FAKE_LLM_LATENCY": str(args.llm_latency),
+        "CYBERGUARD_LLM_RATE": str(args.llm_rate),
+        "CYBERGUARD_LLM_BURST": str(max(int(args.llm_rate), 1)),
+        "CYBERGUARD_SPEECH_BACKEND": "stub",
+        "CYBERGUARD_STUB_TRANSCRIPT": SAMPLE_ANSWERS[DICTATED_FIELD],
+        "CYBERGUARD_STUB_SPEECH_LATENCY": str(args.speech_latency),
+        "CYBERGUARD_STORE_URL": f"sqlite:///{os.path.join(workdir, 'complaints.db')}",
+        "CYBERGUARD_CACHE_DB": os.path.join(workdir, "translation_cache.db"),
+        "CYBERGUARD_EVIDENCE_DIR": os.path.join(workdir, "evidence"),
+        "CYBERGUARD_PDF_CACHE_DIR": os.path.join(workdir, "pdf_cache"),
+        "CYBERGUARD_JOBS_DB": os.path.join(workdir, "jobs.db"),
+        "CYBERGUARD_SPOOL_DIR": os.path.join(workdir, "spool"),
+        "CYBERGUARD_CHAT_DB": os.path.join(workdir, "chat_history.db")
+    })
+    os.environ.pop("CYBERGUARD_LLM_URL", None)
+    os.environ.pop("CYBERGUARD_TRANSCRIPT_CACHE_DB", None)
+    os.environ.pop("CYBERGUARD_METRICS_LOG", None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark complaint filing throughput with fake backends.")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 10, 100], help="concurrency levels to run")
+    parser.add_argument("--complaints-per-user", type=int, default=3)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds the fake model waits per call")
+    parser.add_argument("--speech-latency", type=float, default=0.05, help="seconds the stub recognizer waits per segment")
+    parser.add_argument("--llm-rate", type=float, default=1000.0, help="client-side model calls per second")
+    parser.add_argument("--languages", nargs="+", help="languages to sample from (default: all)")
+    parser.add_argument("--no-voice", action="store_true", help="don't dictate answers through speech.transcribe_file")
+    parser.add_argument("--no-trace-memory", action="store_true", help="skip tracemalloc (it slows allocation-heavy code)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cyberguard-bench-") as workdir:
+        configure_environment(workdir, args)
+        from portal_data import languages
+
+        pipeline = Pipeline(voice=not args.no_voice)
+        sampled = {lang: languages[lang] for lang in args.languages} if args.languages else languages
+        # One unmeasured complaint per language and flow, so every level starts with the question
+        # texts cached, as on a long-running server.
+        for i, lang in enumerate(sampled):
+            pipeline.chatbot(f"warm-{i}", lang, "Financial Fraud", sampled[lang])
+            pipeline.manual(f"warm-{i}", lang, "Financial Fraud")
+
+        report = {
+            "benchmark": "complaint_pipeline",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "config": {
+                "complaints_per_user": args.complaints_per_user,
+                "llm_latency_s": args.llm_latency,
+                "speech_latency_s": args.speech_latency,
+                "llm_rate": args.llm_rate,
+                "languages": list(sampled),
+                "voice": not args.no_voice,
+                "seed": args.seed
+            },
+            "levels": [run_level(pipeline, users, args.complaints_per_user, sampled, args.seed, not args.no_trace_memory)
+                       for users in args.users]
+        }
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import zipfile
+from collections import deque
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, PageBreak
+
+import ticket_model
+from complaint_pdf import complaint_story, generate_complaint_pdf, ticket_pdf_data
+from process_pool import spawn_pool
+
+
+def select_tickets(store, status=None, category=None, date_from=None, date_to=None):
+    """Iterate the tickets matching the filters. Dates are 'YYYY-MM-DD'."""
+    if date_to and len(date_to) == 10:
+        date_to = f"{date_to} 23:59:59"
+    return store.iter_tickets(status, category, date_from, date_to)
+
+
+def _render(payload):
+    ticket = ticket_model.loads(payload)
+    return ticket.ticket_id, generate_complaint_pdf(ticket_pdf_data(ticket)).getvalue()
+
+
+def _bounded_map(pool, fn, items, window):
+    """Like pool.map, but keeps at most `window` tasks (and their results) in flight."""
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def export_zip(tickets, output, workers=None):
+    """Render tickets in a process pool and stream each PDF into a ZIP archive. Returns the count.
+
+    Tickets go to the workers as ticket_model.dumps() strings.
+    """
+    workers = workers or os.cpu_count() or 1
+    count = 0
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive, spawn_pool(workers) as pool:
+        for ticket_id, pdf_bytes in _bounded_map(pool, _render, map(ticket_model.dumps, tickets), workers * 4):
+            archive.writestr(f"Complaint_{ticket_id}.pdf", pdf_bytes)
+            count += 1
+    return count
+
+
+def export_combined_pdf(tickets, output):
+    """Write all tickets into one PDF, one section per complaint. Returns the count.
+
+    ReportLab lays the document out in a single pass, so this mode runs in-process; only the
+    lightweight flowables are kept until the build, not rendered documents.
+    """
+    styles = getSampleStyleSheet()
+    story = []
+    count = 0
+    for ticket in tickets:
+        if story:
+            story.append(PageBreak())
+        story.extend(complaint_story(ticket_pdf_data(ticket), styles))
+        count += 1
+    if story:
+        SimpleDocTemplate(output, pagesize=letter).build(story)
+    return count
+
+
+if __name__ == "__main__":
+    from complaint_store import store
+
+    parser = argparse.ArgumentParser(description="Export complaint reports in bulk.")
+    parser.add_argument("--status", help="e.g. 'Under Investigation' or 'Resolved'")
+    parser.add_argument("--category", help="e.g. 'Financial Fraud'")
+    parser.add_argument("--from", dest="date_from", help="first filing date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", help="last filing date, YYYY-MM-DD")
+    parser.add_argument("--format", choices=["zip", "pdf"], default="zip")
+    parser.add_argument("--workers", type=int, help="render processes for ZIP export (default: CPU count)")
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args()
+
+    tickets = select_tickets(store, args.status, args.category, args.date_from, args.date_to)
+    if args.format == "zip":
+        exported = export_zip(tickets, args.output, args.workers)
+    else:
+        exported = export_combined_pdf(tickets, args.output)
+    print(f"Exported {exported} complaints to {args.output}")
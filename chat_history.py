@@ -0,0 +1,119 @@
+"""Chatbot transcript kept to a bounded window in memory, with older messages spilled to SQLite."""
+import html
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+
+WINDOW = int(os.environ.get("CYBERGUARD_CHAT_WINDOW", "40"))
+# Spilled messages of sessions that never submitted are dropped after this many seconds.
+RETENTION = 7 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    is_user INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (session_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS chat_messages_created_at ON chat_messages (created_at);
+"""
+
+
+def render_message(message, is_user=False):
+    """The HTML fragment for one chat bubble."""
+    message_class = "user-message" if is_user else "bot-message"
+    return f'<div class="chat-message {message_class}">{html.escape(message)}</div>'
+
+
+class ChatStore:
+    """Spilled chat messages of every session in the process, in one SQLite file."""
+
+    def __init__(self, path, retention=RETENTION):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            conn.execute("DELETE FROM chat_messages WHERE created_at < ?", (time.time() - retention,))
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def spill(self, session_id, messages):
+        """Save [(seq, is_user, message)] for a session."""
+        now = time.time()
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO chat_messages (session_id, seq, is_user, message, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(session_id, seq, int(is_user), message, now) for seq, is_user, message in messages]
+            )
+
+    def load(self, session_id):
+        """Return a session's spilled [(is_user, message)], oldest first."""
+        rows = self._connection().execute(
+            "SELECT is_user, message FROM chat_messages WHERE session_id = ? ORDER BY seq", (session_id,)
+        ).fetchall()
+        return [(bool(is_user), message) for is_user, message in rows]
+
+    def delete(self, session_id):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM chat_messages WHERE session_id = ?", (session_id,))
+
+
+store = ChatStore(os.environ.get("CYBERGUARD_CHAT_DB", "chat_history.db"))
+
+
+class ChatHistory:
+    """One session's transcript: the last `window` messages in memory, the rest in the ChatStore.
+
+    Spilling happens `window // 4` messages at a time, so it costs one write every few turns.
+    Each message is rendered to HTML once, when added, and the window's HTML is kept joined.
+    Holds no reference to the store, so it pickles with the rest of the session state.
+    """
+
+    def __init__(self, window=WINDOW):
+        self.session_id = uuid.uuid4().hex
+        self.window = max(window, 4)
+        self.messages = deque()  # (seq, is_user, message, fragment)
+        self.spilled = 0
+        self._html = ""
+
+    def __len__(self):
+        return self.spilled + len(self.messages)
+
+    def append(self, message, is_user=False):
+        fragment = render_message(message, is_user)
+        self.messages.append((self.spilled + len(self.messages), is_user, message, fragment))
+        if len(self.messages) > self.window:
+            batch = [self.messages.popleft()[:3] for _ in range(self.window // 4)]
+            store.spill(self.session_id, batch)
+            self.spilled += len(batch)
+            self._html = "".join(entry[3] for entry in self.messages)
+        else:
+            self._html += fragment
+
+    def html(self):
+        """The window's messages as one HTML string."""
+        return self._html
+
+    def earlier_html(self):
+        """The spilled messages as one HTML string, read back from the store."""
+        if not self.spilled:
+            return ""
+        return "".join(render_message(message, is_user) for is_user, message in store.load(self.session_id))
+
+    def clear(self):
+        if self.spilled:
+            store.delete(self.session_id)
+        self.messages.clear()
+        self.spilled = 0
+        self._html = ""
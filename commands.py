@@ -0,0 +1,56 @@
+import re
+import unicodedata
+
+from portal_data import languages, native_commands, command_fallbacks, command_variants, command_filler_words
+
+ZERO_WIDTH_RE = re.compile("[\u200b\u200c\u200d\ufeff]")
+TERMINAL = None
+
+
+def _tokens(text):
+    text = ZERO_WIDTH_RE.sub("", unicodedata.normalize("NFKC", text)).casefold()
+    return "".join(" " if unicodedata.category(ch)[0] in "PS" else ch for ch in text).split()
+
+
+FILLER_WORDS = {token for word in command_filler_words for token in _tokens(word)}
+
+
+def normalize(text):
+    """NFKC-normalize, case-fold and tokenize text, dropping punctuation, zero-width joiners and filler words."""
+    return tuple(token for token in _tokens(text) if token not in FILLER_WORDS)
+
+
+def _build_trie(phrases):
+    """Token trie mapping normalized phrases to their command."""
+    trie = {}
+    for phrase, command in phrases:
+        node = trie
+        for token in normalize(phrase):
+            node = node.setdefault(token, {})
+        if node is not trie:
+            node.setdefault(TERMINAL, command)
+    return trie
+
+
+def _phrases(lang):
+    words = native_commands.get(lang) or native_commands[command_fallbacks.get(lang, "English")]
+    for source in (words, native_commands["English"]):
+        for command, phrase in source.items():
+            yield phrase, command
+    for command, variants in command_variants.items():
+        for phrase in variants:
+            yield phrase, command
+
+
+# Compiled once at import: one trie per supported language.
+COMMAND_INDEX = {lang: _build_trie(_phrases(lang)) for lang in languages}
+
+
+def match_command(user_input, lang):
+    """Return 'next', 'back', 'submit' or 'repeat' if the whole input is a navigation command, else None."""
+    node = COMMAND_INDEX.get(lang, COMMAND_INDEX["English"])
+    for token in normalize(user_input):
+        node = node.get(token)
+        if node is None:
+            return None
+    return node.get(TERMINAL)
@@ -0,0 +1,173 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib import colors
+
+import instrumentation
+from form_schema import pdf_rows
+
+# Bump when complaint_story's output changes, so cached PDFs from the old layout aren't served.
+LAYOUT_VERSION = 2
+
+
+def complaint_story(data, styles):
+    """Build the flowables for one complaint report."""
+    story = []
+
+    story.append(Paragraph("CYBER CRIME COMPLAINT REPORT", styles['Heading1']))
+    story.append(Spacer(1, 12))
+
+    complaint_data = [
+        ["Field", "Details"],
+        ["Ticket Number", data.get('ticket_id', '')],
+        ["Date Filed", data.get('date_filed', '')],
+        *[[label, value] for label, value in pdf_rows(data)],
+        ["Category", f"{data.get('category', '')} - {data.get('sub_category', '')}"],
+        ["Status", data.get('status', '')],
+        ["Assigned Officer", data.get('assigned_to', '')],
+        ["Priority", data.get('priority', '')]
+    ]
+
+    table = Table(complaint_data, colWidths=[150, 400])
+    table.setStyle(TableStyle([
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ]))
+    story.append(table)
+    return story
+
+
+@instrumentation.timed("generate_complaint_pdf")
+def generate_complaint_pdf(data):
+    """Generate a PDF with only user-provided data."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.build(complaint_story(data, getSampleStyleSheet()))
+    buffer.seek(0)
+    return buffer
+
+
+def ticket_pdf_data(ticket):
+    """Build the generate_complaint_pdf input for a stored ticket_model.Ticket."""
+    return ticket.pdf_fields()
+
+
+def content_version(data):
+    """Hash of the PDF input and layout, so any change to a ticket or the report produces a new cache entry."""
+    payload = json.dumps([LAYOUT_VERSION, data], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class PDFCache:
+    """LRU of rendered PDFs bounded by total bytes; evicted entries spill to a disk directory.
+
+    The spill directory is pruned every `PRUNE_EVERY` spills (and at startup): files older than
+    `ttl` seconds go first, then the least recently used until it fits in `max_spill_bytes`.
+    """
+
+    PRUNE_EVERY = 64
+
+    def __init__(self, spill_dir, max_memory_bytes=32 * 1024 * 1024, max_spill_bytes=512 * 1024 * 1024, ttl=30 * 24 * 3600):
+        self.spill_dir = spill_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_spill_bytes = max_spill_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._memory_bytes = 0
+        self._spills = 0
+        self._lock = threading.Lock()
+        os.makedirs(spill_dir, exist_ok=True)
+        self.prune()
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, f"{key[0]}-{key[1]}.pdf")
+
+    def get(self, key):
+        """Return cached PDF bytes for (ticket_id, version), or None."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        path = self._spill_path(key)
+        try:
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        self.put(key, pdf_bytes)
+        return pdf_bytes
+
+    def put(self, key, pdf_bytes):
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = pdf_bytes
+            self._memory_bytes += len(pdf_bytes)
+            evicted = []
+            while self._memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+                old_key, old_bytes = self._entries.popitem(last=False)
+                self._memory_bytes -= len(old_bytes)
+                evicted.append((old_key, old_bytes))
+        for old_key, old_bytes in evicted:
+            path = self._spill_path(old_key)
+            if not os.path.exists(path):
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(old_bytes)
+                os.replace(tmp_path, path)
+                with self._lock:
+                    self._spills += 1
+                    prune = self._spills % self.PRUNE_EVERY == 0
+                if prune:
+                    self.prune()
+
+    def prune(self):
+        """Delete spilled PDFs past the age or size limit."""
+        files = []
+        for entry in os.scandir(self.spill_dir):
+            if not entry.name.endswith(".pdf"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort(reverse=True)
+        cutoff, total = time.time() - self.ttl, 0
+        for mtime, size, path in files:
+            if mtime >= cutoff and total + size <= self.max_spill_bytes:
+                total += size
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+cache = PDFCache(os.environ.get("CYBERGUARD_PDF_CACHE_DIR", "pdf_cache"))
+
+
+def peek_pdf(ticket_id, data):
+    """Return the PDF bytes if they are already rendered, without rendering them."""
+    return cache.get((ticket_id, content_version(data)))
+
+
+def get_pdf(ticket_id, data):
+    """Return the PDF bytes, rendering and caching them now if needed."""
+    key = (ticket_id, content_version(data))
+    pdf_bytes = cache.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = generate_complaint_pdf(data).getvalue()
+        cache.put(key, pdf_bytes)
+    return pdf_bytes
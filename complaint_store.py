@@ -0,0 +1,306 @@
+import json
+import os
+import queue
+import random
+import sqlite3
+import sys
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+import suspect_index
+import ticket_counters
+import ticket_search
+from ticket_model import Ticket, Status, Priority, Category, label, now, format_time, parse_time, translation_delta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    ticket_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    category TEXT,
+    sub_category TEXT,
+    priority TEXT,
+    assigned_to TEXT,
+    date_filed TEXT NOT NULL,
+    last_updated TEXT NOT NULL,
+    data TEXT NOT NULL,
+    translated_data TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tickets_status ON tickets (status);
+CREATE INDEX IF NOT EXISTS tickets_category ON tickets (category);
+CREATE INDEX IF NOT EXISTS tickets_date_filed ON tickets (date_filed);
+"""
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+TICKET_COLUMNS = "ticket_id, status, category, sub_category, priority, assigned_to, date_filed, last_updated, data, translated_data"
+
+
+class ComplaintStore(ABC):
+    """Storage backend interface for ticket_model.Ticket objects."""
+
+    def save(self, ticket):
+        self.save_many([ticket])
+
+    @abstractmethod
+    def save_many(self, tickets):
+        """Insert an iterable of tickets in one batch."""
+
+    @abstractmethod
+    def get(self, ticket_id):
+        """Return the Ticket for ticket_id, or None."""
+
+    @abstractmethod
+    def update_status(self, ticket_id, status, last_updated):
+        """Change a ticket's status; last_updated is epoch seconds. Returns False if the ticket doesn't exist."""
+
+    @abstractmethod
+    def update(self, ticket_id, changes):
+        """Apply Ticket.updated(**changes) to a stored ticket and return the new ticket, or None."""
+
+    def count_by_status(self):
+        """Return a status -> number of tickets map."""
+        return self.counts("status")
+
+    @abstractmethod
+    def total(self):
+        """Return the number of tickets."""
+
+    @abstractmethod
+    def counts(self, dimension):
+        """Return a value -> number of tickets map for 'status', 'category' or 'priority'."""
+
+    @abstractmethod
+    def hourly_counts(self, since=None, category=None):
+        """Return [(hour bucket, category, count)] for complaints filed per hour."""
+
+    @abstractmethod
+    def search(self, text, category=None, status=None, date_from=None, date_to=None, limit=20):
+        """Full-text search over the English and original complaint text.
+
+        Returns up to limit (ticket_id, category, status, date_filed, snippet) tuples, best match
+        first. Dates are 'YYYY-MM-DD[ HH:MM:SS]' strings.
+        """
+
+    @abstractmethod
+    def linked_cases(self, ticket_id, limit=10):
+        """Return [(kind, value, other ticket count, up to limit other ticket IDs)] for each suspect
+        identifier in this ticket that other tickets also name. See suspect_index."""
+
+    @abstractmethod
+    def suspect_ticket_count(self, kind, value):
+        """Return how many tickets name a canonical suspect identifier."""
+
+    @abstractmethod
+    def rebuild_suspect_index(self, workers=None):
+        """Re-extract every ticket's suspect identifiers, in parallel; returns how many were indexed."""
+
+    @abstractmethod
+    def iter_tickets(self, status=None, category=None, date_from=None, date_to=None):
+        """Yield tickets matching the filters, oldest first. Dates are 'YYYY-MM-DD[ HH:MM:SS]' strings."""
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections in WAL mode, shareable across threads."""
+
+    def __init__(self, path, size=4):
+        self._connections = queue.LifoQueue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._connections.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+
+class SQLiteComplaintStore(ComplaintStore):
+    """Complaint store on a local SQLite file.
+
+    ticket_id is the clustered primary key, so lookups are a B-tree search; status, category and
+    date_filed have their own indexes for filtered listings. Dashboard aggregates (ticket_counters),
+    the full-text index (ticket_search) and the suspect identifier index (suspect_index) are
+    updated in the same transaction as each write. Read-modify-write updates take the write lock
+    (BEGIN IMMEDIATE) before reading, so concurrent updates can't write back a stale row.
+    """
+
+    def __init__(self, path, pool_size=4):
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn, conn:
+            conn.executescript(SCHEMA)
+            conn.executescript(ticket_counters.SCHEMA)
+            conn.executescript(ticket_search.SCHEMA)
+            new_suspect_index = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'suspect_identifiers'"
+            ).fetchone() is None
+            conn.executescript(suspect_index.SCHEMA)
+            if conn.execute("SELECT 1 FROM tickets LIMIT 1").fetchone():
+                if ticket_counters.read_total(conn) == 0:
+                    ticket_counters.rebuild(conn)
+                if ticket_search.is_empty(conn):
+                    rows = conn.execute(f"SELECT {TICKET_COLUMNS} FROM tickets")
+                    ticket_search.rebuild(conn, (_row_ticket(row) for row in rows))
+                if new_suspect_index:
+                    rows = conn.execute(f"SELECT {TICKET_COLUMNS} FROM tickets")
+                    suspect_index.rebuild(conn, *suspect_index.extract_all((_row_ticket(row) for row in rows), workers=1))
+
+    def save_many(self, tickets):
+        tickets = list(tickets)
+        rows = [_ticket_row(ticket) for ticket in tickets]
+        with self.pool.connection() as conn, conn:
+            conn.executemany(f"INSERT INTO tickets ({TICKET_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            ticket_counters.record_new_tickets(conn, (
+                {"status": row[1], "category": row[2], "priority": row[4], "date_filed": row[6]} for row in rows
+            ))
+            ticket_search.index_tickets(conn, tickets)
+            suspect_index.index_tickets(conn, tickets)
+
+    def get(self, ticket_id):
+        with self.pool.connection() as conn:
+            row = conn.execute(f"SELECT {TICKET_COLUMNS} FROM tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
+        return _row_ticket(row) if row else None
+
+    def update_status(self, ticket_id, status, last_updated):
+        with self.pool.connection() as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status, category, date_filed FROM tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
+            if row is None:
+                return False
+            conn.execute("UPDATE tickets SET status = ?, last_updated = ? WHERE ticket_id = ?",
+                         (str(status), format_time(last_updated), ticket_id))
+            ticket_counters.record_status_change(conn, row[0], str(status))
+            ticket_search.update_filters(conn, ticket_id, row[1], str(status), row[2])
+        return True
+
+    def update(self, ticket_id, changes):
+        with self.pool.connection() as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(f"SELECT {TICKET_COLUMNS} FROM tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
+            if row is None:
+                return None
+            ticket = _row_ticket(row).updated(**changes)
+            new_row = _ticket_row(ticket)
+            conn.execute(
+                "UPDATE tickets SET status = ?, category = ?, sub_category = ?, priority = ?, assigned_to = ?, "
+                "date_filed = ?, last_updated = ?, data = ?, translated_data = ? WHERE ticket_id = ?",
+                new_row[1:] + (ticket_id,)
+            )
+            ticket_counters.record_change(conn, _counted(row), _counted(new_row))
+            if new_row[8:] != row[8:]:
+                ticket_search.reindex_ticket(conn, ticket)
+                suspect_index.reindex_ticket(conn, ticket)
+            elif _filtered(new_row) != _filtered(row):
+                ticket_search.update_filters(conn, ticket_id, *_filtered(new_row))
+        return ticket
+
+    def total(self):
+        with self.pool.connection() as conn:
+            return ticket_counters.read_total(conn)
+
+    def counts(self, dimension):
+        with self.pool.connection() as conn:
+            return ticket_counters.read_counts(conn, dimension)
+
+    def hourly_counts(self, since=None, category=None):
+        with self.pool.connection() as conn:
+            return ticket_counters.read_hourly(conn, since, category)
+
+    def search(self, text, category=None, status=None, date_from=None, date_to=None, limit=20):
+        with self.pool.connection() as conn:
+            return ticket_search.search(conn, text, category, status, date_from, date_to, limit)
+
+    def linked_cases(self, ticket_id, limit=10):
+        with self.pool.connection() as conn:
+            return suspect_index.linked(conn, ticket_id, limit)
+
+    def suspect_ticket_count(self, kind, value):
+        with self.pool.connection() as conn:
+            return suspect_index.ticket_count(conn, kind, value)
+
+    def rebuild_suspect_index(self, workers=None):
+        ticket_ids, entries = suspect_index.extract_all(self.iter_tickets(), workers)
+        with self.pool.connection() as conn, conn:
+            suspect_index.rebuild(conn, ticket_ids, entries)
+        return len(entries)
+
+    def iter_tickets(self, status=None, category=None, date_from=None, date_to=None):
+        clauses, params = [], []
+        for clause, value in (("status = ?", status), ("category = ?", category),
+                              ("date_filed >= ?", date_from), ("date_filed <= ?", date_to)):
+            if value:
+                clauses.append(clause)
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.pool.connection() as conn:
+            cursor = conn.execute(f"SELECT {TICKET_COLUMNS} FROM tickets {where} ORDER BY date_filed", params)
+            for row in cursor:
+                yield _row_ticket(row)
+
+
+OFFICERS = ["Kumar", "Singh", "Sharma", "Patel", "Gupta"]
+PRIORITIES = [Priority.HIGH, Priority.MEDIUM, Priority.LOW]
+UNASSIGNED = "Pending assignment"
+
+
+def assignment():
+    """Pick the officer and priority for a new ticket, as {"assigned_to", "priority"}."""
+    return {"assigned_to": f"Officer {random.choice(OFFICERS)}", "priority": random.choice(PRIORITIES)}
+
+
+def new_ticket(data, translated_data, assign=True):
+    """Build a freshly filed Ticket with a new ID, under investigation.
+
+    Without assign the officer and priority are left pending, to be filled in by update() later.
+    """
+    ticket = Ticket.create(
+        f"CYBER-{uuid.uuid4().hex[:8].upper()}", data, translated_data,
+        Status.UNDER_INVESTIGATION, Priority.PENDING, UNASSIGNED, now()
+    )
+    return ticket.updated(**assignment()) if assign else ticket
+
+
+def _ticket_row(ticket):
+    return (
+        ticket.ticket_id, str(ticket.status), ticket.category and str(ticket.category), ticket.sub_category,
+        str(ticket.priority), ticket.assigned_to, format_time(ticket.date_filed), format_time(ticket.last_updated),
+        _encode(ticket.data), _encode(ticket.translated)
+    )
+
+
+def _counted(row):
+    return {"status": row[1], "category": row[2], "priority": row[4]}
+
+
+def _filtered(row):
+    return row[2], row[1], row[6]
+
+
+def _row_ticket(row):
+    ticket_id, status, category, sub_category, priority, assigned_to, date_filed, last_updated, data, translated = row
+    data = json.loads(data)
+    return Ticket(
+        ticket_id, label(Status, status), label(Priority, priority), label(Category, category),
+        sub_category and sys.intern(sub_category), sys.intern(assigned_to),
+        parse_time(date_filed), parse_time(last_updated),
+        # Rows written before tickets stored only the changed translations hold the full English dict.
+        data, translation_delta(data, json.loads(translated))
+    )
+
+
+BACKENDS = {"sqlite": SQLiteComplaintStore}
+
+
+def open_store(url):
+    """Open a store from a URL such as 'sqlite:///complaints.db'."""
+    scheme, _, path = url.partition(":///")
+    if scheme not in BACKENDS:
+        raise ValueError(f"Unknown complaint store backend: {scheme}")
+    return BACKENDS[scheme](path)
+
+
+store = open_store(os.environ.get("CYBERGUARD_STORE_URL", "sqlite:///complaints.db"))
@@ -0,0 +1,92 @@
+import hashlib
+import mmap
+import os
+import tempfile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class EvidenceTooLarge(Exception):
+    """Raised when an upload exceeds the per-file or per-ticket size limit."""
+
+
+class EvidenceStore:
+    """Content-addressed blob directory for evidence uploads.
+
+    Uploads are streamed to disk in CHUNK_SIZE pieces while being hashed, then moved to
+    <root>/<sha256[:2]>/<sha256>, so identical files are stored once. Tickets keep only the
+    returned reference dicts.
+    """
+
+    def __init__(self, root, max_file_bytes=20 * 1024 * 1024, max_ticket_bytes=50 * 1024 * 1024):
+        self.root = root
+        self.max_file_bytes = max_file_bytes
+        self.max_ticket_bytes = max_ticket_bytes
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, sha256):
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def put(self, fileobj, name, budget=None):
+        """Stream fileobj into the store and return {"name", "sha256", "size"}.
+
+        budget caps the bytes this file may use on top of max_file_bytes (the remainder of the
+        ticket limit). Raises EvidenceTooLarge if either limit is exceeded.
+        """
+        limit = self.max_file_bytes if budget is None else min(self.max_file_bytes, budget)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+                    size += len(chunk)
+                    if size > limit:
+                        raise EvidenceTooLarge(f"{name} exceeds the remaining upload limit of {limit / (1024 * 1024):.1f} MB")
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            sha256 = digest.hexdigest()
+            final_path = self.path_for(sha256)
+            if os.path.exists(final_path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(tmp_path, final_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return {"name": name, "sha256": sha256, "size": size}
+
+    def put_many(self, files):
+        """Store (fileobj, name) pairs for one ticket, enforcing max_ticket_bytes across them."""
+        refs, remaining = [], self.max_ticket_bytes
+        for fileobj, name in files:
+            ref = self.put(fileobj, name, budget=remaining)
+            remaining -= ref["size"]
+            refs.append(ref)
+        return refs
+
+    def check_sizes(self, sizes):
+        """Raise EvidenceTooLarge if (name, size) pairs for one ticket would exceed either limit."""
+        total = 0
+        for name, size in sizes:
+            total += size
+            if size > self.max_file_bytes:
+                raise EvidenceTooLarge(f"{name} exceeds the upload limit of {self.max_file_bytes / (1024 * 1024):.1f} MB")
+            if total > self.max_ticket_bytes:
+                raise EvidenceTooLarge(f"{name} exceeds the remaining upload limit of {(self.max_ticket_bytes - total + size) / (1024 * 1024):.1f} MB")
+
+    def open(self, sha256):
+        """Return a read-only memory map of a stored blob. The caller closes it."""
+        with open(self.path_for(sha256), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+store = EvidenceStore(
+    os.environ.get("CYBERGUARD_EVIDENCE_DIR", "evidence"),
+    max_file_bytes=int(os.environ.get("CYBERGUARD_EVIDENCE_MAX_FILE_MB", "20")) * 1024 * 1024,
+    max_ticket_bytes=int(os.environ.get("CYBERGUARD_EVIDENCE_MAX_TICKET_MB", "50")) * 1024 * 1024
+)
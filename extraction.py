@@ -0,0 +1,174 @@
+import datetime
+import json
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+from llm import get_client
+from portal_data import id_types
+from translation import CODE_FENCE_RE, translate_cached
+
+# Decimal digits of the Indic scripts (and Arabic-script digits used for Urdu, Sindhi and
+# Kashmiri, Ol Chiki for Santali, Meetei Mayek for Manipuri) mapped to ASCII.
+DIGIT_TABLE = {
+    cp: str(unicodedata.decimal(chr(cp)))
+    for block in (range(0x0660, 0x0670), range(0x06F0, 0x06FA), range(0x0966, 0x0DF0),
+                  range(0x1C50, 0x1C5A), range(0xABF0, 0xABFA), range(0xFF10, 0xFF1A))
+    for cp in block
+    if unicodedata.category(chr(cp)) == "Nd"
+}
+
+MOBILE_RE = re.compile(r"(?<!\d)(?:\+?91[\s-]?|0)?([6-9]\d{4})[\s-]?(\d{5})(?!\d)")
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+UTR_RE = re.compile(r"(?<![\d-])(\d{4})[\s-]?(\d{4})[\s-]?(\d{4})(?![\d-])")
+AMOUNT_RE = re.compile(
+    r"(?:₹|rs\.?|inr)?\s*(\d{1,3}(?:,\d{2,3})+|\d+)(\.\d{1,2})?\s*(?:(lakhs?|lacs?|crores?|cr|k|thousand)(?![a-z]))?",
+    re.I
+)
+AMOUNT_MULTIPLIERS = {"lakh": 100000, "lac": 100000, "crore": 10000000, "cr": 10000000, "k": 1000, "thousand": 1000}
+NUMERIC_DATE_RE = re.compile(r"(?<!\d)(\d{1,4})[/.-](\d{1,2})[/.-](\d{2,4})(?!\d)")
+MONTHS = {m.lower(): i for i, m in enumerate(
+    ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"], 1)}
+MONTHS.update({name[:3]: i for name, i in list(MONTHS.items())})
+MONTH_PATTERN = "|".join(sorted(MONTHS, key=len, reverse=True))
+DAY_MONTH_RE = re.compile(rf"(?<!\d)(\d{{1,2}})(?:st|nd|rd|th)?\s+({MONTH_PATTERN})\.?,?\s+(\d{{4}})", re.I)
+MONTH_DAY_RE = re.compile(rf"\b({MONTH_PATTERN})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})", re.I)
+RELATIVE_DAYS = {"today": 0, "yesterday": 1, "आज": 0}
+
+# Answers parsed locally with at least this confidence skip the model.
+LOCAL_CONFIDENCE = 0.8
+stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def normalize_digits(text):
+    """Replace Indic and other non-ASCII decimal digits with ASCII ones."""
+    return text.translate(DIGIT_TABLE)
+
+
+def _single(values):
+    """Value with full confidence if exactly one distinct candidate was found."""
+    distinct = list(dict.fromkeys(values))
+    if not distinct:
+        return None
+    return distinct[0], 1.0 if len(distinct) == 1 else 0.3
+
+
+def _parse_mobile(text):
+    return _single(a + b for a, b in MOBILE_RE.findall(text))
+
+
+def _parse_email(text):
+    return _single(m.lower() for m in EMAIL_RE.findall(text))
+
+
+def _parse_utr(text):
+    return _single("".join(m) for m in UTR_RE.findall(text))
+
+
+def _parse_amount(text):
+    amounts = []
+    for whole, fraction, unit in AMOUNT_RE.findall(text):
+        value = float(whole.replace(",", "") + (fraction or ""))
+        if unit:
+            value *= AMOUNT_MULTIPLIERS[unit.lower().rstrip("s")]
+        amounts.append(f"{value:.2f}".rstrip("0").rstrip("."))
+    return _single(amounts)
+
+
+def _parse_date(text, today=None):
+    today = today or datetime.date.today()
+    dates = []
+    for a, b, c in NUMERIC_DATE_RE.findall(text):
+        year, month, day = (int(a), int(b), int(c)) if len(a) == 4 else (int(c), int(b), int(a))
+        if year < 100:
+            year += 2000
+        dates.append((year, month, day))
+    for day, month, year in DAY_MONTH_RE.findall(text):
+        dates.append((int(year), MONTHS[month.lower()[:3]], int(day)))
+    for month, day, year in MONTH_DAY_RE.findall(text):
+        dates.append((int(year), MONTHS[month.lower()[:3]], int(day)))
+    parsed = []
+    for year, month, day in dates:
+        try:
+            parsed.append(datetime.date(year, month, day).isoformat())
+        except ValueError:
+            pass
+    for word, days_ago in RELATIVE_DAYS.items():
+        if re.search(rf"(?<!\w){word}(?!\w)", text, re.I):
+            parsed.append((today - datetime.timedelta(days=days_ago)).isoformat())
+    return _single(parsed)
+
+
+LOCAL_PARSERS = {
+    "phone": _parse_mobile,
+    "suspect_mobile": _parse_mobile,
+    "email": _parse_email,
+    "suspect_email": _parse_email,
+    "transaction_id": _parse_utr,
+    "fraud_amount": _parse_amount,
+    "transaction_date": _parse_date,
+}
+
+
+def extract_local(field, user_input):
+    """Parse structured fields without a model call. Returns (value, confidence) or None."""
+    parser = LOCAL_PARSERS.get(field)
+    if parser is None:
+        return None
+    return parser(normalize_digits(user_input))
+
+
+def _record(outcome):
+    with _stats_lock:
+        stats[outcome] += 1
+
+
+def local_hit_rate():
+    """Share of structured-field answers that were parsed without the model."""
+    with _stats_lock:
+        attempts = stats["local"] + stats["fallback"]
+        return stats["local"] / attempts if attempts else 0.0
+
+
+def _extract_prompt(field, user_input, lang):
+    if field == "id_type":
+        task = (f"Identify the ID type from this '{lang}' input. Options are: {', '.join(id_types)}. "
+                f"Use the selected option as both \"value\" and \"english\", and set \"valid\" to false if it is unclear.")
+    else:
+        task = (f"Extract the {field} from this '{lang}' input. Put the extracted value in its original language in "
+                f"\"value\", its English translation in \"english\", and set \"valid\" to false if the input doesn't contain a {field}.")
+    return f"{task} Reply with only a JSON object with the keys \"value\", \"english\" and \"valid\": '{user_input}'"
+
+
+def extract_answer(field, user_input, lang):
+    """Extract a field value, its English translation and a validity verdict in one model call.
+
+    Returns {"value", "english", "valid"}. Structured fields (phone numbers, emails, UTRs,
+    amounts, dates) are parsed locally first and only reach the model when the parse isn't
+    confident. If the model doesn't answer with usable JSON, its reply is taken as the value and
+    translated separately.
+    """
+    if field in LOCAL_PARSERS:
+        local = extract_local(field, user_input)
+        if local and local[1] >= LOCAL_CONFIDENCE:
+            _record("local")
+            return {"value": local[0], "english": local[0], "valid": True}
+        _record("fallback")
+    reply = get_client().generate(_extract_prompt(field, user_input, lang))
+    try:
+        parsed = json.loads(CODE_FENCE_RE.sub("", reply))
+        value = str(parsed["value"]).strip()
+        english = str(parsed.get("english") or value).strip()
+        valid = parsed.get("valid", True) is not False
+    except (ValueError, KeyError, TypeError):
+        value = reply
+        english = value if lang == "English" else translate_cached(value, lang, "English")
+        valid = True
+    if lang == "English":
+        english = value
+    if field == "id_type":
+        valid = valid and english in id_types
+        value = english
+    return {"value": value, "english": english, "valid": valid}
@@ -0,0 +1,78 @@
+"""Local stand-in for the Gemini API.
+
+Run `python fake_llm_server.py --port 8765` and start the app with
+CYBERGUARD_LLM_URL=http://127.0.0.1:8765/generate to exercise the LLM client without network access.
+"""
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUOTED_RE = re.compile(r":\s'(.*)'\s*$", re.S)
+JSON_RE = re.compile(r"(\{.*\})\s*$", re.S)
+ID_TYPES = ["Voter ID", "Driving License", "Passport", "PAN Card", "Aadhar Card"]
+
+
+def fake_reply(prompt):
+    """Deterministic stand-in for the model: echoes the payload each prompt in this app asks about."""
+    if "reply with only the JSON" in prompt:
+        match = JSON_RE.search(prompt)
+        return match.group(1) if match else "{}"
+    match = QUOTED_RE.search(prompt)
+    payload = match.group(1) if match else prompt
+    if prompt.startswith("Identify the ID type"):
+        payload = next((t for t in ID_TYPES if t.lower() in payload.lower()), "Unknown")
+    if "Reply with only a JSON object" in prompt:
+        return json.dumps({"value": payload, "english": payload, "valid": payload != "Unknown"}, ensure_ascii=False)
+    return payload
+
+
+class FakeModel:
+    """In-process fake backend with optional injected latency, for tests and benchmarks."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def generate(self, prompt, timeout):
+        self.calls += 1
+        if self.latency:
+            time.sleep(min(self.latency, timeout))
+        return fake_reply(prompt)
+
+
+def make_handler(latency, failure_rate):
+    class FakeModelHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(latency)
+            if random.random() < failure_rate:
+                self.send_error(503, "Injected failure")
+                return
+            reply = json.dumps({"text": fake_reply(body.get("prompt", ""))}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FakeModelHandler
+
+
+def serve(port=8765, latency=0.0, failure_rate=0.0):
+    return ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency, failure_rate))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve deterministic fake model replies.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each reply")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    args = parser.parse_args()
+    print(f"Fake model listening on http://127.0.0.1:{args.port}/generate")
+    serve(args.port, args.latency, args.failure_rate).serve_forever()
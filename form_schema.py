@@ -0,0 +1,158 @@
+"""Per-category, per-language complaint-form plans compiled from portal_data.form_fields."""
+import re
+import time
+from dataclasses import dataclass
+
+from portal_data import category_notices, complaint_categories, form_fields, id_types
+from suspect_index import canonical_phone
+
+RETRY_SECONDS = 30
+EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]{2,}")
+
+
+def _mobile(value):
+    return None if canonical_phone(value) else "Enter a 10-digit mobile number."
+
+
+def _email(value):
+    return None if EMAIL_RE.fullmatch(value.strip()) else "Enter a valid email address."
+
+
+def _id_type(value):
+    return None if value in id_types else f"Please specify ID type from: {', '.join(id_types)}."
+
+
+def _utr(value):
+    return None if len(re.sub(r"\D", "", value)) == 12 else "Enter the 12-digit Transaction ID or UTR number."
+
+
+def _amount(value):
+    return None if any(c.isdecimal() for c in value) else "Enter the amount in numbers."
+
+
+VALIDATORS = {"mobile": _mobile, "email": _email, "id_type": _id_type, "utr": _utr, "amount": _amount}
+
+
+@dataclass(frozen=True)
+class FieldPlan:
+    field: str
+    label: str
+    question: str
+    widget: str
+    options: tuple
+    height: int  # text_area height in pixels, or None
+    required: bool
+    min_length: int
+    validator: object  # one of VALIDATORS, or None
+
+    def check(self, value):
+        """Return what's wrong with value as an English message, or None if it's acceptable."""
+        value = value.strip() if isinstance(value, str) else ""
+        if not value:
+            return "This field is required." if self.required else None
+        if len(value) < self.min_length:
+            return f"Please enter at least {self.min_length} characters."
+        return self.validator(value) if self.validator else None
+
+
+@dataclass(frozen=True)
+class FormPlan:
+    category: str
+    language: str
+    fields: tuple
+    field_names: tuple
+    notice: str  # or None
+
+    def validate(self, values):
+        """Return [(label, message)] for every field of values that fails its checks."""
+        errors = []
+        for f in self.fields:
+            message = f.check(values.get(f.field))
+            if message:
+                errors.append((f.label, message))
+        return errors
+
+
+def _applies(spec, category):
+    return category is None or category in spec.get("categories", complaint_categories)
+
+
+def form_texts():
+    """Every translatable form string, keyed so a batch translation can be mapped back."""
+    texts = {f"label:{spec['field']}": spec["label"] for spec in form_fields}
+    texts.update((f"question:{spec['field']}", spec["question"]["English"]) for spec in form_fields)
+    texts.update((f"notice:{category}", notice) for category, notice in category_notices.items())
+    return texts
+
+
+def _translated_texts(language):
+    """Return (texts, complete); complete is False if some fell back to English."""
+    texts = form_texts()
+    if language == "English":
+        return texts, True
+    from translation import translate_batch, untranslated
+    translated = translate_batch(texts, "English", language)
+    missing = untranslated(texts, "English", language)
+    for spec in form_fields:
+        if language in spec["question"]:
+            key = f"question:{spec['field']}"
+            translated[key] = spec["question"][language]
+            missing.discard(key)
+    return translated, not missing
+
+
+def compile_plan(category, language, texts=None):
+    """Build the plan for a category (None: every field) from form_fields, translating if needed."""
+    texts = texts or _translated_texts(language)[0]
+    fields = tuple(
+        FieldPlan(
+            field=spec["field"],
+            label=texts[f"label:{spec['field']}"],
+            question=texts[f"question:{spec['field']}"],
+            widget=spec.get("widget", "text"),
+            options=tuple(spec.get("options", ())),
+            height=spec.get("height"),
+            required=spec["required"],
+            min_length=spec.get("min_length", 0),
+            validator=VALIDATORS[spec["validator"]] if "validator" in spec else None
+        )
+        for spec in form_fields if _applies(spec, category)
+    )
+    return FormPlan(category, language, fields, tuple(f.field for f in fields), texts.get(f"notice:{category}"))
+
+
+_plans = {}
+_retry_at = {}  # language -> time.monotonic() after which its incomplete plans are recompiled
+
+
+def _compile_language(language):
+    texts, complete = _translated_texts(language)
+    for category in [*complaint_categories, None]:
+        _plans[(category, language)] = compile_plan(category, language, texts)
+    if complete:
+        _retry_at.pop(language, None)
+    else:
+        _retry_at[language] = time.monotonic() + RETRY_SECONDS
+
+
+def plan(category, language="English"):
+    """The compiled FormPlan for a complaint category and language.
+
+    A language's plans are compiled together on first use and cached; if some of its texts fell
+    back to English they are recompiled after RETRY_SECONDS. An unknown category (e.g. on a
+    legacy ticket) gets the plan with every field.
+    """
+    if category not in complaint_categories:
+        category = None
+    key = (category, language)
+    if key not in _plans or _retry_at.get(language, float("inf")) <= time.monotonic():
+        _compile_language(language)
+    return _plans[key]
+
+
+def pdf_rows(data):
+    """[(English label, value)] for a complaint's form fields, in form order, for the PDF table."""
+    return [(f.label, data.get(f.field, "")) for f in plan(data.get("category")).fields]
+
+
+_compile_language("English")
@@ -0,0 +1,206 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+process_started = time.time()
+_lock = threading.Lock()
+_import_seconds = None
+_first_rerun = {}
+_reruns = defaultdict(lambda: deque(maxlen=200))
+
+
+def record_imports(seconds):
+    """Record how long the app's top-level imports took; only the first (cold) run counts."""
+    global _import_seconds
+    with _lock:
+        if _import_seconds is None:
+            _import_seconds = seconds
+
+
+def record_rerun(page, seconds):
+    """Record one script run of page. The first run of each page includes its lazy imports."""
+    with _lock:
+        _first_rerun.setdefault(page, seconds)
+        _reruns[page].append(seconds)
+
+
+def timing_report():
+    """Cold-start and per-page rerun timings in milliseconds."""
+    with _lock:
+        pages = {}
+        for page, runs in _reruns.items():
+            ordered = sorted(runs)
+            pages[page] = {
+                "first_run_ms": round(_first_rerun[page] * 1000, 1),
+                "last_ms": round(runs[-1] * 1000, 1),
+                "median_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                "runs": len(runs),
+            }
+        return {
+            "uptime_s": round(time.time() - process_started),
+            "cold_import_ms": round((_import_seconds or 0) * 1000, 1),
+            "pages": pages,
+        }
+
+
+# Histogram bucket upper bounds in seconds (Prometheus-style, cumulative on export).
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RECENT_SAMPLES = 1024
+
+
+class Histogram:
+    """Call count, error count, total time, bucket counts and a window of recent samples for one span."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds, ok):
+        self.count += 1
+        self.errors += 0 if ok else 1
+        self.total += seconds
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.recent.append(seconds)
+
+    def percentile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+histograms = defaultdict(Histogram)
+_rerun = threading.local()
+_json_log = None
+_json_log_path = os.environ.get("CYBERGUARD_METRICS_LOG")
+
+
+def begin_rerun():
+    """Start counting span calls for the current script run on this thread."""
+    _rerun.calls = defaultdict(int)
+
+
+def rerun_calls():
+    """Span name -> calls made so far in the current script run on this thread."""
+    return dict(getattr(_rerun, "calls", {}))
+
+
+def record_span(name, seconds, ok=True):
+    global _json_log
+    with _lock:
+        histograms[name].observe(seconds, ok)
+        if _json_log_path:
+            if _json_log is None:
+                _json_log = open(_json_log_path, "a", buffering=1, encoding="utf-8")
+            _json_log.write(json.dumps({"ts": round(time.time(), 3), "span": name, "ms": round(seconds * 1000, 2), "ok": ok}) + "\n")
+    calls = getattr(_rerun, "calls", None)
+    if calls is not None:
+        calls[name] += 1
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block under name."""
+    started = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        record_span(name, time.perf_counter() - started, ok)
+
+
+def timed(name):
+    """Decorator that records every call of the function as a span."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot(reset=False):
+    """Span name -> (count, errors, recent samples in seconds); with reset, start over afterwards."""
+    with _lock:
+        taken = {name: (h.count, h.errors, list(h.recent)) for name, h in histograms.items()}
+        if reset:
+            histograms.clear()
+    return taken
+
+
+def span_summary():
+    """Per-span rows with calls this run, total calls, errors and p50/p95 latency in ms."""
+    this_run = rerun_calls()
+    with _lock:
+        return [
+            {
+                "span": name,
+                "calls this run": this_run.get(name, 0),
+                "calls": h.count,
+                "errors": h.errors,
+                "p50 ms": round(h.percentile(0.5) * 1000, 1),
+                "p95 ms": round(h.percentile(0.95) * 1000, 1),
+            }
+            for name, h in sorted(histograms.items())
+        ]
+
+
+def render_prometheus():
+    """All span histograms in the Prometheus text exposition format."""
+    lines = [
+        "# HELP cyberguard_span_seconds Latency of instrumented calls.",
+        "# TYPE cyberguard_span_seconds histogram",
+    ]
+    with _lock:
+        for name, h in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float("inf"),), h.buckets):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'cyberguard_span_seconds_bucket{{span="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'cyberguard_span_seconds_sum{{span="{name}"}} {h.total}')
+            lines.append(f'cyberguard_span_seconds_count{{span="{name}"}} {h.count}')
+        lines.append("# TYPE cyberguard_span_errors_total counter")
+        for name, h in sorted(histograms.items()):
+            lines.append(f'cyberguard_span_errors_total{{span="{name}"}} {h.errors}')
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_metrics_server = None
+
+
+def start_metrics_server(port):
+    """Serve /metrics on localhost:port from a daemon thread; later calls are no-ops."""
+    global _metrics_server
+    with _lock:
+        if _metrics_server is not None:
+            return
+        _metrics_server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+    threading.Thread(target=_metrics_server.serve_forever, daemon=True).start()
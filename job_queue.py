@@ -0,0 +1,181 @@
+import json
+import sqlite3
+import threading
+import time
+import traceback
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    ticket_id TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_after REAL NOT NULL,
+    lease_until REAL,
+    steps_done TEXT NOT NULL DEFAULT '[]',
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, run_after);
+CREATE INDEX IF NOT EXISTS jobs_ticket ON jobs (ticket_id);
+"""
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job:
+    """A claimed job as seen by its handler. Call step_done() after each resumable step."""
+
+    def __init__(self, queue, job_id, kind, ticket_id, payload, attempts, steps_done):
+        self.queue = queue
+        self.job_id = job_id
+        self.kind = kind
+        self.ticket_id = ticket_id
+        self.payload = payload
+        self.attempts = attempts
+        self.steps_done = steps_done
+
+    def step_done(self, step):
+        """Persist that step finished, so a retry or a restarted worker skips it."""
+        self.steps_done.append(step)
+        self.queue._update(self.job_id, steps_done=json.dumps(self.steps_done))
+
+
+class JobQueue:
+    """Persistent job queue in a SQLite file, drained by a pool of worker threads.
+
+    Jobs survive restarts: a job whose worker died is picked up again once its lease expires.
+    A handler that raises is retried with exponential backoff up to max_attempts times; handlers
+    record finished steps with Job.step_done() so a retry resumes where the last attempt stopped.
+    """
+
+    def __init__(self, path, max_attempts=5, backoff=2.0, lease=300.0, poll_interval=0.5):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.handlers = {}
+        self._wakeup = threading.Event()
+        self._local = threading.local()
+        self._workers = []
+        self._start_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def register(self, kind, handler):
+        """handler(job) runs one job of this kind; raising schedules a retry."""
+        self.handlers[kind] = handler
+
+    def enqueue(self, kind, payload, ticket_id=None):
+        """Queue a job and return its ID. payload must be JSON-serializable."""
+        now = time.time()
+        with self._connection() as conn:
+            job_id = conn.execute(
+                "INSERT INTO jobs (kind, ticket_id, payload, status, run_after, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, ticket_id, json.dumps(payload, ensure_ascii=False), QUEUED, now, now, now)
+            ).lastrowid
+        self._wakeup.set()
+        return job_id
+
+    def jobs_for(self, ticket_id):
+        """Return the jobs for a ticket, oldest first, as dicts."""
+        rows = self._connection().execute(
+            "SELECT job_id, kind, status, attempts, steps_done, error FROM jobs WHERE ticket_id = ? ORDER BY job_id",
+            (ticket_id,)
+        ).fetchall()
+        return [
+            {"job_id": job_id, "kind": kind, "status": status, "attempts": attempts,
+             "steps_done": json.loads(steps_done), "error": error}
+            for job_id, kind, status, attempts, steps_done, error in rows
+        ]
+
+    def counts(self):
+        """Return a status -> number of jobs map."""
+        return dict(self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def start(self, workers=2):
+        """Start worker threads (once per queue object); they run until the process exits."""
+        with self._start_lock:
+            while len(self._workers) < workers:
+                worker = threading.Thread(target=self._work, name=f"job-worker-{len(self._workers)}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def serve(self, workers=2):
+        """Start workers and block the calling thread, for a dedicated worker process."""
+        self.start(workers)
+        for worker in self._workers:
+            worker.join()
+
+    def run_pending(self):
+        """Run ready jobs on the calling thread until none are left. Returns how many ran."""
+        ran = 0
+        while self._run_one():
+            ran += 1
+        return ran
+
+    def _work(self):
+        while True:
+            if not self._run_one():
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def _claim(self):
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT job_id, kind, ticket_id, payload, attempts, steps_done FROM jobs "
+                "WHERE (status = ? AND run_after <= ?) OR (status = ? AND lease_until < ?) ORDER BY job_id LIMIT 1",
+                (QUEUED, now, RUNNING, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_until = ?, updated_at = ? WHERE job_id = ?",
+                    (RUNNING, now + self.lease, now, row[0])
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        job_id, kind, ticket_id, payload, attempts, steps_done = row
+        return Job(self, job_id, kind, ticket_id, json.loads(payload), attempts + 1, json.loads(steps_done))
+
+    def _run_one(self):
+        job = self._claim()
+        if job is None:
+            return False
+        try:
+            self.handlers[job.kind](job)
+        except Exception:
+            error = traceback.format_exc(limit=3)
+            if job.attempts >= self.max_attempts:
+                self._update(job.job_id, status=FAILED, error=error, lease_until=None)
+            else:
+                self._update(job.job_id, status=QUEUED, error=error, lease_until=None,
+                             run_after=time.time() + self.backoff * 2 ** (job.attempts - 1))
+        else:
+            self._update(job.job_id, status=DONE, error=None, lease_until=None)
+        return True
+
+    def _update(self, job_id, **columns):
+        columns["updated_at"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        with self._connection() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*columns.values(), job_id))
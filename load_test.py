@@ -0,0 +1,221 @@
+"""Load test that runs many concurrent sessions of projec.py through Streamlit's AppTest.
+
+Each simulated session opens the Home page, picks a random language and complaint category on
+Register Complaint, files a complaint through either the chatbot or the manual form, then looks
+the ticket up on Track Complaint. AppTest swaps a process-wide runtime on every run, so each
+session runs in its own worker process; sessions share the on-disk complaint store and
+translation cache, like replicas of the app behind a load balancer. The model and speech
+backends are the local fakes used by benchmark.py, with configurable latency, and all state
+lives in a temporary directory.
+
+    python load_test.py --sessions 50 --ramp-up 10 --output load.json
+
+AppTest can't click custom components or upload files, so pages are opened with the ?page= deep
+link and the manual form is submitted without evidence.
+
+The JSON report has per-page latency (one sample per user interaction, including the reruns it
+caused), and per session the script runs, session-state size and peak traced memory, plus the
+first errors seen.
+"""
+import argparse
+import json
+import os
+import pickle
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark import answers_for, configure_environment, summarize
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "projec.py")
+TICKET_RE = re.compile(r"CYBER-[0-9A-F]{8}")
+
+
+class SessionError(Exception):
+    """The app raised or rendered something unexpected during a simulated session."""
+
+
+class Session:
+    """One simulated user driving an AppTest instance of the app."""
+
+    def __init__(self, rng, timeout, think_time):
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = rng
+        self.think_time = think_time
+        self.page_latency = {}
+        self.interactions = 0
+        self.page = "Home"
+        self.at = AppTest.from_file(APP, default_timeout=timeout)
+
+    def run(self, element=None):
+        """Run the script (after changing element, if given) and record the latency against the current page."""
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, self.think_time))
+        started = time.perf_counter()
+        (element or self.at).run()
+        elapsed = time.perf_counter() - started
+        self.interactions += 1
+        self.page_latency.setdefault(self.page, []).append(elapsed)
+        if self.at.exception:
+            raise SessionError(f"{self.page}: {self.at.exception[0].message}")
+
+    def visit(self, page):
+        self.page = page
+        self.at.query_params["page"] = page
+        self.run()
+
+    def button(self, label):
+        return next((b for b in self.at.button if b.label == label), None)
+
+    def filed_ticket(self):
+        for message in self.at.success:
+            match = TICKET_RE.search(message.value)
+            if match:
+                return match.group(0)
+        raise SessionError(f"{self.page}: no ticket ID after submitting")
+
+    def file_with_chatbot(self, answers, questions):
+        self.run(next(c for c in self.at.checkbox if c.label == "Use AI Chatbot to Fill Form").check())
+        for _ in range(len(questions) + 1):
+            submit = self.button("Confirm and Submit")
+            if submit is not None:
+                self.run(submit.click())
+                return self.filed_ticket()
+            index = self.at.session_state["questions_index"]
+            field = questions[index].field
+            box = next(t for t in self.at.text_input if t.key.startswith(f"chat_input_{index}_"))
+            self.run(box.set_value(answers[field]))
+        raise SessionError(f"{self.page}: the chatbot never reached the review form")
+
+    def file_with_form(self, answers, questions):
+        fields = {question.label: question.field for question in questions}
+        for widget in list(self.at.text_input) + list(self.at.text_area):
+            field = fields.get(widget.label)
+            if field:
+                widget.set_value(answers[field])
+        self.run(self.button("Submit Complaint").click())
+        return self.filed_ticket()
+
+    def track(self, ticket_id):
+        self.visit("Track Complaint")
+        box = next(t for t in self.at.text_input if t.label.startswith("Enter Ticket ID"))
+        self.run(box.set_value(ticket_id))
+        if self.at.error or not any(ticket_id in m.value for m in self.at.markdown):
+            raise SessionError(f"{self.page}: ticket {ticket_id} not found")
+
+    def state_bytes(self):
+        try:
+            return len(pickle.dumps(self.at.session_state.to_dict()))
+        except Exception:
+            return None
+
+
+def summarize_values(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"mean": None, "max": None}
+    return {"mean": round(sum(values) / len(values), 2), "max": max(values)}
+
+
+def simulate(n, args):
+    """Run session n in this worker process and return its result row and page latencies."""
+    from form_schema import plan
+    from portal_data import complaint_categories, languages
+
+    rng = random.Random(f"{args.seed}:{n}")
+    if args.ramp_up:
+        time.sleep(args.ramp_up * n / args.sessions)
+    lang = rng.choice(args.languages or list(languages))
+    category = rng.choice(list(complaint_categories))
+    flow = rng.choice(["chatbot", "manual"])
+    questions = plan(category, lang).fields
+    result = {"session": n, "language": lang, "category": category, "flow": flow, "ticket_id": None, "error": None}
+    if not args.no_trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    session = Session(rng, args.timeout, args.think_time)
+    try:
+        session.visit("Home")
+        session.visit("Register Complaint")
+        session.run(session.at.selectbox(key="language_selector").set_value(lang))
+        session.run(session.at.selectbox(key="category_selector").set_value(category))
+        answers = answers_for(f"load-{n}")
+        if flow == "chatbot":
+            ticket_id = session.file_with_chatbot(answers, questions)
+        else:
+            ticket_id = session.file_with_form(answers, questions)
+        result["ticket_id"] = ticket_id
+        session.track(ticket_id)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result.update({
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "interactions": session.interactions,
+        "script_runs": session.at.session_state["script_runs"] if "script_runs" in session.at.session_state else 0,
+        "session_state_bytes": session.state_bytes(),
+        "peak_traced_memory_mb": None
+    })
+    if not args.no_trace_memory:
+        result["peak_traced_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        tracemalloc.stop()
+    return result, session.page_latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run concurrent simulated sessions of the app with AppTest.")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which session starts are spread")
+    parser.add_argument("--think-time", type=float, default=0.0, help="max random pause before each interaction")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds a single script run may take")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds the fake model waits per call")
+    parser.add_argument("--speech-latency", type=float, default=0.05, help="seconds the stub recognizer waits per segment")
+    parser.add_argument("--llm-rate", type=float, default=1000.0, help="client-side model calls per second")
+    parser.add_argument("--languages", nargs="+", help="languages to sample from (default: all)")
+    parser.add_argument("--no-trace-memory", action="store_true", help="skip tracemalloc (it slows allocation-heavy code)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cyberguard-load-") as workdir:
+        configure_environment(workdir, args)
+        os.environ["CYBERGUARD_IMAGE_DIR"] = workdir
+        started = time.perf_counter()
+        with ProcessPoolExecutor(args.sessions) as pool:
+            outcomes = list(pool.map(simulate, range(args.sessions), [args] * args.sessions))
+        elapsed = time.perf_counter() - started
+
+    sessions = [result for result, _ in outcomes]
+    page_latency = {}
+    for _, pages in outcomes:
+        for page, samples in pages.items():
+            page_latency.setdefault(page, []).extend(samples)
+    completed = [s for s in sessions if not s["error"]]
+    report = {
+        "load_test": "projec.py",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "elapsed_s": round(elapsed, 3),
+        "sessions": len(sessions),
+        "completed": len(completed),
+        "errors": [s["error"] for s in sessions if s["error"]][:10],
+        "completed_per_sec": round(len(completed) / elapsed, 2) if elapsed else None,
+        "pages": {page: summarize(samples) for page, samples in sorted(page_latency.items())},
+        "script_runs_per_session": summarize_values(s["script_runs"] for s in sessions),
+        "session_state_bytes": summarize_values(s["session_state_bytes"] for s in sessions),
+        "peak_traced_memory_mb_per_session": summarize_values(s["peak_traced_memory_mb"] for s in sessions),
+        "session_results": sessions
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# Language mappings (supporting all 23 languages)
+languages = {
+    "Hindi": "hi-IN", "Konkani": "kok-IN", "Kannada": "kn-IN", "Dogri": "doi-IN",
+    "Bodo": "brx-IN", "Urdu": "ur-IN", "Tamil": "ta-IN", "Kashmiri": "ks-IN",
+    "Assamese": "as-IN", "Bengali": "bn-IN", "Marathi": "mr-IN", "Sindhi": "sd-IN",
+    "Maithili": "mai-IN", "Punjabi": "pa-IN", "Malayalam": "ml-IN", "Manipuri": "mni-IN",
+    "Telugu": "te-IN", "Sanskrit": "sa-IN", "Nepali": "ne-IN", "Santali": "sat-IN",
+    "Gujarati": "gu-IN", "Odia": "or-IN", "English": "en-IN"
+}
+tts_lang_codes = {k: v.split('-')[0] + '-' + v.split('-')[1].upper() for k, v in languages.items()}
+native_commands = {
+    "English": {"next": "next", "back": "back", "submit": "submit", "repeat": "repeat"},
+    "Hindi": {"next": "अगला", "back": "पीछे", "submit": "जमा करें", "repeat": "दोहराएं"},
+    "Tamil": {"next": "அடுத்து", "back": "பின்னால்", "submit": "சமர்ப்பி", "repeat": "மீண்டும்"},
+    "Telugu": {"next": "తదుపరి", "back": "వెనక్కి", "submit": "సమర్పించు", "repeat": "పునరావృతం"},
+    "Kannada": {"next": "ಮುಂದಿನ", "back": "ಹಿಂದೆ", "submit": "ಸಲ್ಲಿಸು", "repeat": "ಪುನರಾವರ್ತನೆ"},
+    "Malayalam": {"next": "അടുത്തത്", "back": "പിന്നോട്ട്", "submit": "സമർപ്പിക്കുക", "repeat": "ആവർത്തിക്കുക"},
+    "Marathi": {"next": "पुढील", "back": "मागे", "submit": "सादर करा", "repeat": "पुनरावृत्ती"},
+    "Bengali": {"next": "পরবর্তী", "back": "পিছনে", "submit": "জমা দিন", "repeat": "পুনরাবৃত্তি"},
+    "Gujarati": {"next": "આગળ", "back": "પાછળ", "submit": "સબમિટ કરો", "repeat": "પુનરાવર્તન"},
+    "Punjabi": {"next": "ਅਗਲਾ", "back": "ਪਿੱਛੇ", "submit": "ਜਮ੍ਹਾ ਕਰੋ", "repeat": "ਦੁਹਰਾਓ"},
+    "Urdu": {"next": "اگلا", "back": "پیچھے", "submit": "جمع کریں", "repeat": "دہرائیں"},
+    "Nepali": {"next": "अर्को", "back": "पछाडि", "submit": "पेश गर्नुहोस्", "repeat": "दोहोर्याउनुहोस्"},
+    "Odia": {"next": "ପରବର୍ତ୍ତୀ", "back": "ପଛକୁ", "submit": "ଦାଖଲ କରନ୍ତୁ", "repeat": "ପୁନରାବୃତ୍ତି"},
+    "Assamese": {"next": "পৰৱৰ্তী", "back": "পিছলৈ", "submit": "দাখিল কৰক", "repeat": "পুনৰাবৃত্তি"},
+    "Maithili": {"next": "अगिला", "back": "पाछाँ", "submit": "जमा करू", "repeat": "दोहराउ"},
+    "Konkani": {"next": "फुडलें", "back": "फाटीं", "submit": "सादर करात", "repeat": "परत सांगात"},
+    "Dogri": {"next": "अगला", "back": "पिच्छें", "submit": "जमा करो", "repeat": "दोहराओ"},
+    "Sanskrit": {"next": "अग्रिमम्", "back": "पूर्वम्", "submit": "प्रेषयतु", "repeat": "पुनः"},
+    "Sindhi": {"next": "اڳيون", "back": "پوئتي", "submit": "جمع ڪرايو", "repeat": "ورجايو"}
+}
+# Languages without their own command words above use the words of a language in the same script.
+command_fallbacks = {"Kashmiri": "Urdu", "Manipuri": "Bengali", "Bodo": "Hindi", "Santali": "Hindi"}
+# Extra spoken forms per command, accepted in every language.
+command_variants = {
+    "next": ["next", "skip", "continue", "आगे", "अगला सवाल"],
+    "back": ["back", "previous", "पिछला"],
+    "submit": ["submit", "done", "finish", "सबमिट", "जमा करो"],
+    "repeat": ["repeat", "again", "say again", "फिर से", "दोबारा"]
+}
+# Words ignored around a command, e.g. "next please" or "go back".
+command_filler_words = ["please", "pls", "ok", "okay", "now", "go", "the", "question", "that", "कृपया", "प्लीज़", "सवाल", "प्रश्न", "जी"]
+
+# Complaint categories
+complaint_categories = {
+    "Women/Children Related Crime": [
+        "Rape/Gang Rape (RGR)-Sexually Abusive Content",
+        "Sexually Obscene material",
+        "Child Pornography (CP)-Child Sexual Abuse Material (CSEAM)",
+        "Sexually Explicit Act"
+    ],
+    "Financial Fraud": [
+        "UPI Fraud",
+        "Credit/Debit Card Fraud",
+        "Online Banking Fraud",
+        "Investment Fraud",
+        "Insurance Fraud"
+    ],
+    "Other Cyber Crime": [
+        "Website Hacking",
+        "IP Theft",
+        "Online Gambling",
+        "Cryptocurrency Fraud",
+        "General Complaint"
+    ]
+}
+
+# Accepted values for the id_type field
+id_types = ["Voter ID", "Driving License", "Passport", "PAN Card", "Aadhar Card"]
+
+# Complaint form fields, in the order the chatbot asks them and the forms show them. "label" is the
+# short form label and "question" the chatbot prompt. A field applies to every complaint category
+# unless "categories" lists them. "widget" is text (default), text_area or select (with "options");
+# "validator" names a check in form_schema.VALIDATORS and "min_length" a minimum answer length.
+# form_schema compiles these into per-category, per-language plans.
+anonymous_categories = ["Women/Children Related Crime"]
+identified_categories = ["Financial Fraud", "Other Cyber Crime"]
+form_fields = [
+    {"field": "incident_datetime", "label": "Incident Date & Time", "question": {"English": "What is the approximate date and time of the incident?"}, "required": True},
+    {"field": "reason_delay", "label": "Reason for Delay in Reporting (if any)", "question": {"English": "What is the reason for delay in reporting?"}, "required": False, "categories": anonymous_categories, "widget": "text_area"},
+    {"field": "state_ut", "label": "State/Union Territory", "question": {"English": "Which State or Union Territory did the incident occur in?"}, "required": True, "categories": anonymous_categories},
+    {"field": "district", "label": "District", "question": {"English": "Which district did the incident occur in?"}, "required": True, "categories": anonymous_categories},
+    {"field": "police_station", "label": "Nearest Police Station (if known)", "question": {"English": "Which police station is nearest to where the incident occurred?"}, "required": False, "categories": anonymous_categories},
+    {"field": "incident_location", "label": "Where did the incident occur? (e.g., Email, WhatsApp)", "question": {"English": "Where did the incident occur? (e.g., Email, Facebook, WhatsApp, Website URL)"}, "required": True, "categories": anonymous_categories},
+    {"field": "incident_details", "label": "Incident Details (min 200 characters)", "question": {"English": "Please provide details about the incident (minimum 200 characters)"}, "required": True, "widget": "text_area", "height": 200, "min_length": 200},
+    {"field": "suspect_info_type", "label": "Suspect Information Type (e.g., Email, Mobile)", "question": {"English": "What type of information do you have about the suspect? (e.g., Email, Mobile Number, Social Media Profile URL)"}, "required": False},
+    {"field": "suspect_info_value", "label": "Suspect Information Value", "question": {"English": "Please provide the suspect's information based on the type selected"}, "required": False},
+    {"field": "suspect_additional_info", "label": "Additional Suspect Information", "question": {"English": "Any additional information about the suspect?"}, "required": False, "widget": "text_area"},
+    {"field": "name", "label": "Full Name", "question": {"English": "What is your full name?"}, "required": True, "categories": identified_categories},
+    {"field": "phone", "label": "Phone Number", "question": {"English": "What is your contact phone number?"}, "required": True, "categories": identified_categories, "validator": "mobile"},
+    {"field": "email", "label": "Email Address", "question": {"English": "What is your email address?"}, "required": True, "categories": identified_categories, "validator": "email"},
+    {"field": "address", "label": "Address", "question": {"English": "What is your current address?"}, "required": True, "categories": identified_categories, "widget": "text_area"},
+    {"field": "id_type", "label": "ID Type", "question": {"English": "What type of ID would you like to provide? Please choose from: Voter ID, Driving License, Passport, PAN Card, Aadhar Card"}, "required": True, "categories": identified_categories, "widget": "select", "options": id_types, "validator": "id_type"},
+    {"field": "id_number", "label": "ID Number", "question": {"English": "What is the number on that ID?"}, "required": True, "categories": identified_categories},
+    {"field": "bank_wallet_merchant", "label": "Bank/Wallet/Merchant Name", "question": {"English": "What is the name of the bank, wallet, or merchant involved?"}, "required": False, "categories": ["Financial Fraud"]},
+    {"field": "transaction_id", "label": "Transaction ID/UTR Number", "question": {"English": "What is the 12-digit Transaction ID or UTR Number?"}, "required": False, "categories": ["Financial Fraud"], "validator": "utr"},
+    {"field": "transaction_date", "label": "Transaction Date", "question": {"English": "What is the date of the transaction?"}, "required": False, "categories": ["Financial Fraud"]},
+    {"field": "fraud_amount", "label": "Fraud Amount", "question": {"English": "What is the amount of the fraud?"}, "required": False, "categories": ["Financial Fraud"], "validator": "amount"},
+    {"field": "suspect_website_social", "label": "Suspected Website/Social Media Handles", "question": {"English": "Do you have any suspected website URLs or social media handles?"}, "required": False, "widget": "text_area"},
+    {"field": "suspect_mobile", "label": "Suspect Mobile Number", "question": {"English": "What is the suspect's mobile number, if known?"}, "required": False, "validator": "mobile"},
+    {"field": "suspect_email", "label": "Suspect Email ID", "question": {"English": "What is the suspect's email ID, if known?"}, "required": False, "validator": "email"},
+    {"field": "suspect_bank_account", "label": "Suspect Bank Account Number", "question": {"English": "What is the suspect's bank account number, if known?"}, "required": False},
+    {"field": "suspect_address", "label": "Suspect Address", "question": {"English": "What is the suspect's address, if known?"}, "required": False, "widget": "text_area"}
+]
+
+# Shown above the form for a complaint category
+category_notices = {
+    "Women/Children Related Crime": "This category allows anonymous reporting. Personal details are not required."
+}
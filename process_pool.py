@@ -0,0 +1,12 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def spawn_pool(workers):
+    """A ProcessPoolExecutor whose workers are spawned, not forked.
+
+    The app runs these pools from a threaded server (Streamlit plus the job-queue workers); a
+    forked child could inherit a lock held by another thread, such as instrumentation's or
+    logging's, and deadlock on it.
+    """
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
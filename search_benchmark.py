@@ -0,0 +1,156 @@
+"""Query-latency benchmark for the complaint full-text index.
+
+Fills a temporary complaint store with synthetic tickets through the normal save path (so the
+counters and the FTS5 index are built incrementally, as in production), then times a mix of
+searches: common, mid-frequency and rare words, two-word queries, prefixes, suspect phone
+numbers, original-language words, and common words filtered by category, status or date.
+
+    python search_benchmark.py --docs 1000000 --output search_bench.json
+
+Prints (or writes) one JSON document with the build rate, database size and p50/p99 latency per
+query kind.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmark import summarize
+
+CATEGORY_SUBCATEGORIES = {
+    "Financial Fraud": ["UPI Fraud", "Debit/Credit Card Fraud", "Internet Banking Fraud", "Investment Scam"],
+    "Women/Children Related Crime": ["Sexually Obscene material", "Sexually Explicit Act"],
+    "Other Cyber Crime": ["Hacking", "Phishing", "Online Gambling", "Cryptocurrency Fraud"]
+}
+DOMAIN_WORDS = ["otp", "upi", "bank", "call", "link", "whatsapp", "instagram", "refund", "kyc", "loan",
+                "lottery", "investment", "crypto", "password", "account", "card", "job", "parcel", "courier", "customs"]
+HINDI_WORDS = ["कॉल", "बैंक", "पैसे", "खाता", "धोखा", "लिंक", "संदेश", "नौकरी", "इनाम", "पुलिस"]
+
+
+def vocabulary(size, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set(DOMAIN_WORDS)
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(4, 9))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+class Corpus:
+    """Synthetic complaint text with Zipf-distributed word frequencies."""
+
+    def __init__(self, vocabulary_size, seed):
+        self.rng = random.Random(seed)
+        self.words = vocabulary(vocabulary_size, self.rng)
+        self.cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(self.words))))
+        self.phones = []
+
+    def sentence(self, low, high):
+        return " ".join(self.rng.choices(self.words, cum_weights=self.cum_weights, k=self.rng.randint(low, high)))
+
+    def ticket(self, n, now, span_days):
+        from ticket_model import Ticket, Status, Priority
+
+        rng = self.rng
+        category = rng.choice(list(CATEGORY_SUBCATEGORIES))
+        phone = f"9{rng.randrange(10 ** 9):09d}"
+        if len(self.phones) < 1000:
+            self.phones.append(phone)
+        english = {
+            "category": category,
+            "sub_category": rng.choice(CATEGORY_SUBCATEGORIES[category]),
+            "incident_details": self.sentence(30, 80),
+            "incident_location": rng.choice(["WhatsApp", "Facebook", "Instagram", "Telegram", "Email", "Phone call"]),
+            "suspect_additional_info": self.sentence(5, 15),
+            "suspect_mobile": phone,
+            "name": f"Complainant {n}",
+            "phone": f"8{rng.randrange(10 ** 9):09d}"
+        }
+        data = dict(english)
+        if rng.random() < 0.3:
+            data["incident_details"] = " ".join(rng.choices(HINDI_WORDS, k=rng.randint(10, 30)))
+        filed = now - rng.randrange(span_days * 86400)
+        status = Status.RESOLVED if rng.random() < 0.2 else Status.UNDER_INVESTIGATION
+        return Ticket.create(f"CYBER-{n:08X}", data, english, status, rng.choice(list(Priority)[1:]),
+                             f"Officer {rng.choice(['Kumar', 'Singh', 'Sharma', 'Patel', 'Gupta'])}", filed)
+
+
+def query_mix(corpus, rng):
+    """(kind, query text, filters) generators for each query kind."""
+    common, middle, rare = corpus.words[:20], corpus.words[200:400], corpus.words[-2000:]
+    date_from = time.strftime("%Y-%m-%d", time.localtime(time.time() - 30 * 86400))
+    return {
+        "common_word": lambda: (rng.choice(common), {}),
+        "mid_frequency_word": lambda: (rng.choice(middle), {}),
+        "rare_word": lambda: (rng.choice(rare), {}),
+        "two_words": lambda: (f"{rng.choice(common)} {rng.choice(middle)}", {}),
+        "prefix": lambda: (f"{rng.choice(middle)[:3]}*", {}),
+        "suspect_phone": lambda: (rng.choice(corpus.phones), {}),
+        "hindi_word": lambda: (rng.choice(HINDI_WORDS), {}),
+        "common_word_by_category": lambda: (rng.choice(common), {"category": rng.choice(list(CATEGORY_SUBCATEGORIES))}),
+        "common_word_resolved": lambda: (rng.choice(common), {"status": "Resolved"}),
+        "common_word_last_30_days": lambda: (rng.choice(common), {"date_from": date_from}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-text complaint search.")
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000, help="tickets per save_many call")
+    parser.add_argument("--vocabulary", type=int, default=50_000)
+    parser.add_argument("--span-days", type=int, default=365, help="filing dates are spread over this many days")
+    parser.add_argument("--queries", type=int, default=50, help="queries per kind")
+    parser.add_argument("--limit", type=int, default=20, help="results per query")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cyberguard-search-") as workdir:
+        # complaint_store opens CYBERGUARD_STORE_URL on import, so point it here first.
+        os.environ["CYBERGUARD_STORE_URL"] = f"sqlite:///{os.path.join(workdir, 'complaints.db')}"
+        from complaint_store import store
+        corpus = Corpus(args.vocabulary, args.seed)
+        now = int(time.time())
+        started = time.perf_counter()
+        for first in range(0, args.docs, args.batch):
+            store.save_many(corpus.ticket(n, now, args.span_days) for n in range(first, min(first + args.batch, args.docs)))
+        build_seconds = time.perf_counter() - started
+        db_bytes = sum(os.path.getsize(os.path.join(workdir, name)) for name in os.listdir(workdir))
+
+        rng = random.Random(args.seed)
+        queries = {}
+        for kind, make in query_mix(corpus, rng).items():
+            samples, hits = [], 0
+            for _ in range(args.queries):
+                text, filters = make()
+                started = time.perf_counter()
+                results = store.search(text, limit=args.limit, **filters)
+                samples.append(time.perf_counter() - started)
+                hits += len(results)
+            queries[kind] = dict(summarize(samples), mean_results=round(hits / args.queries, 1))
+
+    report = {
+        "benchmark": "complaint_search",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "build": {
+            "seconds": round(build_seconds, 1),
+            "docs_per_sec": round(args.docs / build_seconds) if build_seconds else None,
+            "database_mb": round(db_bytes / (1024 * 1024), 1)
+        },
+        "queries": queries
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
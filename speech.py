@@ -0,0 +1,231 @@
+import hashlib
+import math
+import operator
+import os
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+
+import speech_recognition as sr
+
+from tiered_cache import TieredCache
+
+MAX_SEGMENT_WORKERS = 4
+FRAME_SECONDS = 0.03
+# split_on_silence's threshold calibration: how much of the clip it looks at, how far above the
+# noise floor counts as voice, and the lowest threshold it will pick.
+CALIBRATION_SECONDS = 5.0
+ENERGY_RATIO = 2.0
+MIN_ENERGY_THRESHOLD = 10
+SAMPLE_TYPES = {1: "b", 2: "h", 4: "i"}
+
+
+class GoogleBackend:
+    """Google Web Speech API (the default)."""
+
+    def transcribe(self, recognizer, audio, language_code):
+        return recognizer.recognize_google(audio, language=language_code)
+
+
+class SphinxBackend:
+    """CMU Sphinx, fully offline. Needs pocketsphinx and its language models installed."""
+
+    def transcribe(self, recognizer, audio, language_code):
+        return recognizer.recognize_sphinx(audio, language=language_code.replace("-IN", "-US"))
+
+
+class StubBackend:
+    """Returns a fixed transcript for every segment, for tests and load runs without audio hardware."""
+
+    def __init__(self, text="stub transcript", latency=0.0):
+        self.text = text
+        self.latency = latency
+
+    def transcribe(self, recognizer, audio, language_code):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.text
+
+
+def make_backend():
+    """Pick the recognizer from CYBERGUARD_SPEECH_BACKEND: 'google' (default), 'sphinx' or 'stub'."""
+    name = os.environ.get("CYBERGUARD_SPEECH_BACKEND", "google")
+    if name == "sphinx":
+        return SphinxBackend()
+    if name == "stub":
+        return StubBackend(os.environ.get("CYBERGUARD_STUB_TRANSCRIPT", "stub transcript"),
+                           float(os.environ.get("CYBERGUARD_STUB_SPEECH_LATENCY", "0")))
+    return GoogleBackend()
+
+
+backend = make_backend()
+
+
+def transcribe_segment(audio, language_code):
+    """Transcribe one segment; unintelligible segments become ''. RequestError propagates."""
+    try:
+        return backend.transcribe(sr.Recognizer(), audio, language_code)
+    except sr.UnknownValueError:
+        return ""
+
+
+def stitch(texts):
+    return " ".join(t for t in texts if t)
+
+
+def stream_microphone(language_code, calibration, on_partial=None, first_timeout=5, pause_timeout=1.5,
+                      total_time_limit=15, phrase_time_limit=5):
+    """Record from the microphone in voice-activity segments and transcribe them concurrently.
+
+    recognizer.listen() returns at each pause, so every utterance becomes its own segment and
+    is sent to the backend while the next one is still being recorded. on_partial(text) is called
+    on the caller's thread with the in-order transcript of the segments finished so far.
+    calibration is a dict (e.g. in session state) that caches the ambient-noise energy threshold
+    so only the first recording pays for adjust_for_ambient_noise.
+
+    Returns the full transcript. Raises sr.WaitTimeoutError if nothing was said and
+    sr.UnknownValueError if nothing could be understood.
+    """
+    recognizer = sr.Recognizer()
+    futures = []
+    reported = 0
+    with sr.Microphone() as source, ThreadPoolExecutor(MAX_SEGMENT_WORKERS) as pool:
+        if "energy_threshold" in calibration:
+            recognizer.energy_threshold = calibration["energy_threshold"]
+        else:
+            recognizer.adjust_for_ambient_noise(source, duration=1)
+            calibration["energy_threshold"] = recognizer.energy_threshold
+        deadline = time.monotonic() + total_time_limit
+        while time.monotonic() < deadline:
+            try:
+                audio = recognizer.listen(
+                    source, timeout=pause_timeout if futures else first_timeout,
+                    phrase_time_limit=min(phrase_time_limit, max(deadline - time.monotonic(), 0.5))
+                )
+            except sr.WaitTimeoutError:
+                if not futures:
+                    raise
+                break
+            futures.append(pool.submit(transcribe_segment, audio, language_code))
+            done = 0
+            while done < len(futures) and futures[done].done():
+                done += 1
+            if on_partial and done > reported:
+                on_partial(stitch(f.result() for f in futures[:done]))
+                reported = done
+        text = stitch(f.result() for f in futures)
+    calibration["energy_threshold"] = recognizer.energy_threshold
+    if not text:
+        raise sr.UnknownValueError()
+    return text
+
+
+def file_digest(fileobj):
+    """SHA-256 of a file-like object, read in chunks; the position is reset to the start."""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def rms(frame, sample_width):
+    """Root mean square of a frame of little-endian signed PCM samples, like audioop.rms."""
+    if sample_width == 3:
+        samples = [int.from_bytes(frame[i:i + 3], "little", signed=True) for i in range(0, len(frame) - 2, 3)]
+    else:
+        samples = array(SAMPLE_TYPES[sample_width], frame[:len(frame) - len(frame) % sample_width])
+        if sys.byteorder == "big":
+            samples.byteswap()
+    return math.isqrt(sum(map(operator.mul, samples, samples)) // len(samples)) if samples else 0
+
+
+def calibrate(levels):
+    """Energy threshold for a clip from the RMS levels of its opening frames.
+
+    The quietest tenth of the frames is taken as the noise floor, so speech that starts right away
+    doesn't throw it off; voice is anything ENERGY_RATIO times louder.
+    """
+    ordered = sorted(levels)
+    noise = ordered[len(ordered) // 10] if ordered else 0
+    return max(noise * ENERGY_RATIO, MIN_ENERGY_THRESHOLD)
+
+
+def split_on_silence(stream, sample_rate, sample_width, min_silence=0.5, max_segment=30.0, energy_threshold=None):
+    """Read raw PCM from stream frame by frame and yield segments separated by silence.
+
+    stream is an sr.AudioFile stream, whose read() takes a number of samples, not bytes.
+
+    A segment ends after min_silence seconds below energy_threshold, or when it reaches
+    max_segment seconds. Without energy_threshold it is calibrated from the first
+    CALIBRATION_SECONDS of the clip, so quiet recordings still split. Silent stretches are dropped
+    apart from min_silence seconds of lead-in before each segment.
+    """
+    frame_samples = max(int(sample_rate * FRAME_SECONDS), 1)
+    silence_frames = int(min_silence / FRAME_SECONDS)
+    max_frames = int(max_segment / FRAME_SECONDS)
+    frames = ((frame, rms(frame, sample_width)) for frame in iter(lambda: stream.read(frame_samples), b""))
+    if energy_threshold is None:
+        opening = list(islice(frames, int(CALIBRATION_SECONDS / FRAME_SECONDS)))
+        energy_threshold = calibrate([level for _, level in opening])
+        frames = chain(opening, frames)
+    segment, voiced, quiet = [], False, 0
+    for frame, level in frames:
+        segment.append(frame)
+        if level >= energy_threshold:
+            voiced, quiet = True, 0
+        else:
+            quiet += 1
+        if voiced and (quiet >= silence_frames or len(segment) >= max_frames):
+            yield b"".join(segment)
+            segment, voiced, quiet = [], False, 0
+        elif not voiced and len(segment) > silence_frames:
+            del segment[0]
+    if voiced:
+        yield b"".join(segment)
+
+
+# Transcripts keyed by (file digest, language). LRU in memory; set CYBERGUARD_TRANSCRIPT_CACHE_DB
+# to also keep them in a SQLite file across restarts. transcripts.stats() has the hit/miss counters.
+transcripts = TieredCache(os.environ.get("CYBERGUARD_TRANSCRIPT_CACHE_DB"), "transcripts", max_memory_entries=256)
+
+
+def transcribe_file(fileobj, language_code, workers=MAX_SEGMENT_WORKERS, max_segment=30.0, digest=None):
+    """Transcribe an uploaded WAV/AIFF/FLAC file of any length.
+
+    The file is read in frames, split on silence into segments of at most max_segment seconds,
+    and the segments are transcribed on a worker pool with a bounded number in flight, then
+    joined in order; if no segment is found, the whole file is recognized at once. Results are
+    memoized in `transcripts` by (content hash, language), so the same upload on a rerun isn't
+    transcribed again; pass digest if it is already known.
+    Raises sr.UnknownValueError if nothing was understood.
+    """
+    key = f"{digest or file_digest(fileobj)}:{language_code}"
+    text = transcripts.get(key)
+    if text is not None:
+        return text
+
+    texts, pending, segments = [], deque(), 0
+    with sr.AudioFile(fileobj) as source, ThreadPoolExecutor(workers) as pool:
+        for pcm in split_on_silence(source.stream, source.SAMPLE_RATE, source.SAMPLE_WIDTH, max_segment=max_segment):
+            audio = sr.AudioData(pcm, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+            pending.append(pool.submit(transcribe_segment, audio, language_code))
+            segments += 1
+            if len(pending) >= workers * 2:
+                texts.append(pending.popleft().result())
+        texts.extend(f.result() for f in pending)
+    if not segments:
+        # Nothing rose above the threshold; give the recognizer the whole clip, as before splitting.
+        fileobj.seek(0)
+        with sr.AudioFile(fileobj) as source:
+            texts = [transcribe_segment(sr.Recognizer().record(source), language_code)]
+    text = stitch(texts)
+    if not text:
+        raise sr.UnknownValueError()
+
+    transcripts.set(key, text)
+    return text
@@ -0,0 +1,275 @@
+import argparse
+import os
+import re
+import unicodedata
+from collections import deque
+from itertools import islice
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from process_pool import spawn_pool
+
+# Canonicalized suspect phones, emails, UPI IDs, URLs, handles and accounts per ticket, with per-identifier ticket counts.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suspect_identifiers (
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    ticket_id TEXT NOT NULL,
+    PRIMARY KEY (kind, value, ticket_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS suspect_identifiers_ticket ON suspect_identifiers (ticket_id);
+CREATE TABLE IF NOT EXISTS suspect_identifier_counts (
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    tickets INTEGER NOT NULL,
+    PRIMARY KEY (kind, value)
+) WITHOUT ROWID;
+"""
+
+KIND_LABELS = {
+    "phone": "Phone",
+    "email": "Email",
+    "upi": "UPI ID",
+    "url": "Website",
+    "handle": "Social media handle",
+    "account": "Bank account"
+}
+UPSERT_COUNT = """
+INSERT INTO suspect_identifier_counts (kind, value, tickets) VALUES (?, ?, 1)
+ON CONFLICT (kind, value) DO UPDATE SET tickets = tickets + 1
+"""
+
+TLDS = "com|in|net|org|info|biz|io|co|me|app|xyz|online|site|top|live|shop|club|ly|gl|to|gg|tk|ml|ga|cf|gq"
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+UPI_RE = re.compile(r"[\w.-]{2,}@[a-z]{2,}(?![\w.@])", re.IGNORECASE)
+URL_RE = re.compile(rf"https?://[^\s,;]+|(?<![\w@.])(?:www\.)?(?:[a-z0-9-]+\.)+(?:{TLDS})\b(?:/[^\s,;]*)?", re.IGNORECASE)
+HANDLE_RE = re.compile(r"(?<![\w@])@[a-z0-9_.]{2,30}", re.IGNORECASE)
+PHONE_RE = re.compile(r"\+?\d[\d\s().-]{6,16}\d")
+ACCOUNT_RE = re.compile(r"(?<!\w)\d[\d -]{7,22}\d(?!\w)")
+TRACKING_PARAMS = ("utm_", "fbclid", "igshid", "gclid", "si")
+
+
+def _digits(text):
+    """The decimal digits in text as ASCII, including Devanagari and other Unicode digits."""
+    return "".join(str(unicodedata.decimal(c)) for c in text if c.isdecimal())
+
+
+def canonical_phone(text):
+    """'+91 98450-12345', '09845012345' and '9845012345' -> '+919845012345'; None if not a phone number."""
+    digits = _digits(text)
+    if len(digits) == 12 and digits.startswith("91"):
+        digits = digits[2:]
+    elif len(digits) == 11 and digits.startswith("0"):
+        digits = digits[1:]
+    if len(digits) == 10:
+        return "+91" + digits
+    if text.lstrip().startswith("+") and 8 <= len(digits) <= 15:
+        return "+" + digits
+    return None
+
+
+def canonical_email(text):
+    """Lowercase, drop any +tag, and fold Gmail's ignored dots."""
+    local, _, domain = text.strip().strip(".").lower().rpartition("@")
+    if not local or "." not in domain:
+        return None
+    local = local.split("+", 1)[0]
+    if domain in ("gmail.com", "googlemail.com"):
+        local, domain = local.replace(".", ""), "gmail.com"
+    return f"{local}@{domain}" if local else None
+
+
+def canonical_upi(text):
+    return text.strip().lower()
+
+
+def canonical_url(text):
+    """Host and path without scheme, www., trailing slash, fragment or tracking parameters."""
+    text = text.strip().rstrip(".,)")
+    parts = urlsplit(text if "://" in text else "http://" + text)
+    host = (parts.hostname or "").removeprefix("www.").removeprefix("m.")
+    if "." not in host:
+        return None
+    query = [(k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith(TRACKING_PARAMS)]
+    url = host + parts.path.rstrip("/")
+    return url + ("?" + urlencode(sorted(query)) if query else "")
+
+
+def canonical_handle(text):
+    handle = text.strip().rstrip(".").lower()
+    return handle if len(handle) > 2 else None
+
+
+def canonical_account(text):
+    digits = _digits(text)
+    return digits if 9 <= len(digits) <= 18 else None
+
+
+# Tried in this order, each on the text the earlier ones didn't claim, so an email's domain isn't
+# also read as a URL and a phone number isn't also read as an account.
+EXTRACTORS = {
+    "email": (EMAIL_RE, canonical_email),
+    "upi": (UPI_RE, canonical_upi),
+    "url": (URL_RE, canonical_url),
+    "handle": (HANDLE_RE, canonical_handle),
+    "phone": (PHONE_RE, canonical_phone),
+    "account": (ACCOUNT_RE, canonical_account)
+}
+FIELD_KINDS = {
+    "suspect_mobile": ("phone",),
+    "suspect_email": ("email",),
+    "suspect_bank_account": ("upi", "account"),
+    "suspect_website_social": ("email", "url", "handle"),
+    "suspect_info_value": tuple(EXTRACTORS),
+    "suspect_additional_info": tuple(EXTRACTORS)
+}
+# suspect_info_type says what suspect_info_value holds; these words narrow the kinds looked for.
+INFO_TYPE_KINDS = [
+    (("mail",), ("email",)),
+    (("mobile", "phone", "number", "whatsapp"), ("phone",)),
+    (("upi", "bank", "account"), ("upi", "account")),
+    (("url", "website", "link", "social", "profile", "handle", "instagram", "facebook", "telegram"), ("email", "url", "handle"))
+]
+
+
+def extract(text, kinds):
+    """Return the set of (kind, canonical value) identifiers of the given kinds in text."""
+    found = set()
+    for kind in kinds:
+        pattern, canonical = EXTRACTORS[kind]
+
+        def claim(match):
+            value = canonical(match.group())
+            if value is None:
+                return match.group()
+            found.add((kind, value))
+            return " "
+
+        text = pattern.sub(claim, text)
+    return found
+
+
+def identifiers(ticket):
+    """Every suspect identifier in a ticket, from both the original and the English text."""
+    found = set()
+    for data in (ticket.data, ticket.translated) if ticket.translated else (ticket.data,):
+        for field, kinds in FIELD_KINDS.items():
+            text = data.get(field)
+            if not isinstance(text, str) or not text.strip():
+                continue
+            if field == "suspect_info_value":
+                info_type = str(ticket.translated_data.get("suspect_info_type") or "").lower()
+                kinds = next((k for words, k in INFO_TYPE_KINDS if any(w in info_type for w in words)), kinds)
+            found |= extract(text, kinds)
+    return found
+
+
+def _add(conn, ticket_id, found):
+    for kind, value in found:
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO suspect_identifiers (kind, value, ticket_id) VALUES (?, ?, ?)", (kind, value, ticket_id)
+        ).rowcount
+        if inserted:
+            conn.execute(UPSERT_COUNT, (kind, value))
+
+
+def _remove(conn, ticket_id, found):
+    for kind, value in found:
+        deleted = conn.execute(
+            "DELETE FROM suspect_identifiers WHERE kind = ? AND value = ? AND ticket_id = ?", (kind, value, ticket_id)
+        ).rowcount
+        if deleted:
+            conn.execute("UPDATE suspect_identifier_counts SET tickets = tickets - 1 WHERE kind = ? AND value = ?", (kind, value))
+            conn.execute("DELETE FROM suspect_identifier_counts WHERE kind = ? AND value = ? AND tickets <= 0", (kind, value))
+
+
+def index_tickets(conn, tickets):
+    """Add new tickets' identifiers."""
+    for ticket in tickets:
+        _add(conn, ticket.ticket_id, identifiers(ticket))
+
+
+def reindex_ticket(conn, ticket):
+    """Bring a ticket's identifiers up to date after its text changed."""
+    old = set(conn.execute("SELECT kind, value FROM suspect_identifiers WHERE ticket_id = ?", (ticket.ticket_id,)))
+    new = identifiers(ticket)
+    _remove(conn, ticket.ticket_id, old - new)
+    _add(conn, ticket.ticket_id, new - old)
+
+
+def ticket_count(conn, kind, value):
+    """Number of tickets naming an identifier."""
+    row = conn.execute("SELECT tickets FROM suspect_identifier_counts WHERE kind = ? AND value = ?", (kind, value)).fetchone()
+    return row[0] if row else 0
+
+
+def linked(conn, ticket_id, limit=10):
+    """Return [(kind, value, other ticket count, up to limit other ticket IDs)] for a ticket's identifiers
+    that appear in other tickets, most widely reported first."""
+    rows = conn.execute(
+        "SELECT i.kind, i.value, c.tickets - 1 FROM suspect_identifiers i "
+        "JOIN suspect_identifier_counts c ON c.kind = i.kind AND c.value = i.value "
+        "WHERE i.ticket_id = ? AND c.tickets > 1 ORDER BY c.tickets DESC, i.kind, i.value",
+        (ticket_id,)
+    ).fetchall()
+    return [
+        (kind, value, others, [other for (other,) in conn.execute(
+            "SELECT ticket_id FROM suspect_identifiers WHERE kind = ? AND value = ? AND ticket_id != ? LIMIT ?",
+            (kind, value, ticket_id, limit)
+        )])
+        for kind, value, others in rows
+    ]
+
+
+def _extract_chunk(tickets):
+    return [(kind, value, ticket.ticket_id) for ticket in tickets for kind, value in identifiers(ticket)]
+
+
+def extract_all(tickets, workers=None, chunk_size=1000):
+    """Return ([ticket IDs], [(kind, value, ticket_id)]) for an iterable of tickets.
+
+    Extraction is regex work, so with more than one worker it runs in a process pool on chunks of
+    tickets (see process_pool.spawn_pool), with a bounded number of chunks in flight.
+    """
+    workers = workers or os.cpu_count() or 1
+    tickets = iter(tickets)
+    chunks = iter(lambda: list(islice(tickets, chunk_size)), [])
+    ticket_ids, entries = [], []
+    if workers == 1:
+        for chunk in chunks:
+            ticket_ids += [ticket.ticket_id for ticket in chunk]
+            entries += _extract_chunk(chunk)
+        return ticket_ids, entries
+    with spawn_pool(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            ticket_ids += [ticket.ticket_id for ticket in chunk]
+            pending.append(pool.submit(_extract_chunk, chunk))
+            if len(pending) >= workers * 4:
+                entries += pending.popleft().result()
+        while pending:
+            entries += pending.popleft().result()
+    return ticket_ids, entries
+
+
+def rebuild(conn, ticket_ids, entries):
+    """Replace the identifiers of the given tickets with entries and recount every identifier.
+
+    Tickets filed after ticket_ids was read keep the identifiers they were saved with.
+    """
+    conn.executemany("DELETE FROM suspect_identifiers WHERE ticket_id = ?", ((ticket_id,) for ticket_id in ticket_ids))
+    conn.executemany("INSERT OR IGNORE INTO suspect_identifiers (kind, value, ticket_id) VALUES (?, ?, ?)", entries)
+    conn.execute("DELETE FROM suspect_identifier_counts")
+    conn.execute(
+        "INSERT INTO suspect_identifier_counts (kind, value, tickets) "
+        "SELECT kind, value, COUNT(*) FROM suspect_identifiers GROUP BY kind, value"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the suspect identifier index from the complaint store.")
+    parser.add_argument("--workers", type=int, help="extraction processes (default: CPU count)")
+    args = parser.parse_args()
+
+    from complaint_store import store
+
+    print(f"Indexed {store.rebuild_suspect_index(args.workers)} suspect identifiers")
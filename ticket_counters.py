@@ -0,0 +1,92 @@
+from collections import Counter
+
+# Per-status/category/priority and per-hour ticket counts, so the dashboard reads them by primary key.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticket_counters (
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (dimension, value)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ticket_hourly_counts (
+    bucket TEXT NOT NULL,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bucket, category)
+) WITHOUT ROWID;
+"""
+
+DIMENSIONS = ("status", "category", "priority")
+TOTAL = ("total", "")
+UPSERT_COUNTER = """
+INSERT INTO ticket_counters (dimension, value, count) VALUES (?, ?, ?)
+ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count
+"""
+UPSERT_HOURLY = """
+INSERT INTO ticket_hourly_counts (bucket, category, count) VALUES (?, ?, ?)
+ON CONFLICT (bucket, category) DO UPDATE SET count = count + excluded.count
+"""
+
+
+def hour_bucket(timestamp):
+    """Map a 'YYYY-MM-DD HH:MM:SS' timestamp to its 'YYYY-MM-DD HH' bucket."""
+    return timestamp[:13]
+
+
+def record_new_tickets(conn, tickets):
+    """Add counts for tickets, an iterable of dicts with status, category, priority and date_filed."""
+    counters, hourly = Counter(), Counter()
+    for ticket in tickets:
+        counters[TOTAL] += 1
+        for dimension in DIMENSIONS:
+            counters[(dimension, ticket[dimension] or "")] += 1
+        hourly[(hour_bucket(ticket["date_filed"]), ticket["category"] or "")] += 1
+    conn.executemany(UPSERT_COUNTER, [(d, v, n) for (d, v), n in counters.items()])
+    conn.executemany(UPSERT_HOURLY, [(b, c, n) for (b, c), n in hourly.items()])
+
+
+def record_status_change(conn, old_status, new_status):
+    """Move one ticket from old_status to new_status."""
+    record_change(conn, {"status": old_status}, {"status": new_status})
+
+
+def record_change(conn, old, new):
+    """Move one ticket between counters for every dimension whose value differs between the old and new dicts."""
+    changes = []
+    for dimension in DIMENSIONS:
+        if dimension in old and (old[dimension] or "") != (new[dimension] or ""):
+            changes += [(dimension, old[dimension] or "", -1), (dimension, new[dimension] or "", 1)]
+    if changes:
+        conn.executemany(UPSERT_COUNTER, changes)
+
+
+def read_total(conn):
+    row = conn.execute("SELECT count FROM ticket_counters WHERE dimension = ? AND value = ?", TOTAL).fetchone()
+    return row[0] if row else 0
+
+
+def read_counts(conn, dimension):
+    """Return a value -> count map for one dimension."""
+    rows = conn.execute("SELECT value, count FROM ticket_counters WHERE dimension = ? AND count > 0", (dimension,))
+    return dict(rows.fetchall())
+
+
+def read_hourly(conn, since=None, category=None):
+    """Return [(bucket, category, count)] ordered by bucket, optionally from `since` ('YYYY-MM-DD HH')."""
+    clauses, params = [], []
+    if since:
+        clauses.append("bucket >= ?")
+        params.append(since)
+    if category:
+        clauses.append("category = ?")
+        params.append(category)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return conn.execute(f"SELECT bucket, category, count FROM ticket_hourly_counts {where} ORDER BY bucket", params).fetchall()
+
+
+def rebuild(conn):
+    """Recompute every aggregate from the tickets table."""
+    conn.execute("DELETE FROM ticket_counters")
+    conn.execute("DELETE FROM ticket_hourly_counts")
+    rows = conn.execute("SELECT status, category, priority, date_filed FROM tickets")
+    record_new_tickets(conn, (dict(zip(("status", "category", "priority", "date_filed"), row)) for row in rows))
@@ -0,0 +1,155 @@
+"""Compact in-memory representation of a complaint ticket."""
+import datetime
+import enum
+import json
+import sys
+import time
+from dataclasses import dataclass
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class _Label(str, enum.Enum):
+    def __str__(self):
+        return self.value
+
+
+class Status(_Label):
+    UNDER_INVESTIGATION = "Under Investigation"
+    RESOLVED = "Resolved"
+
+
+class Priority(_Label):
+    PENDING = "Pending"
+    HIGH = "High"
+    MEDIUM = "Medium"
+    LOW = "Low"
+
+
+class Category(_Label):
+    WOMEN_CHILDREN = "Women/Children Related Crime"
+    FINANCIAL_FRAUD = "Financial Fraud"
+    OTHER = "Other Cyber Crime"
+
+
+def label(enum_type, value):
+    """Return the enum member for value, or the interned string if it isn't one (e.g. a legacy row)."""
+    if value is None or isinstance(value, enum_type):
+        return value
+    try:
+        return enum_type(value)
+    except ValueError:
+        return sys.intern(value)
+
+
+def now():
+    return int(time.time())
+
+
+def format_time(epoch):
+    """Epoch seconds -> 'YYYY-MM-DD HH:MM:SS' in local time."""
+    return time.strftime(TIME_FORMAT, time.localtime(epoch))
+
+
+def parse_time(text):
+    """'YYYY-MM-DD HH:MM:SS' in local time -> epoch seconds."""
+    return int(datetime.datetime.fromisoformat(text).timestamp())
+
+
+def translation_delta(data, translated_data):
+    """The entries of translated_data that differ from data."""
+    return {k: v for k, v in translated_data.items() if data.get(k) != v}
+
+
+@dataclass(eq=False)
+class Ticket:
+    """A complaint ticket as a __slots__ dataclass.
+
+    Status, priority and category are shared enum members, and officer names and sub-categories
+    are interned, so tickets don't each carry their own strings. Timestamps are epoch seconds.
+    `translated` holds only the English fields that differ from `data`; translated_data overlays them.
+    """
+    __slots__ = ("ticket_id", "status", "priority", "category", "sub_category", "assigned_to",
+                 "date_filed", "last_updated", "data", "translated")
+
+    ticket_id: str
+    status: Status
+    priority: Priority
+    category: Category
+    sub_category: str
+    assigned_to: str
+    date_filed: int
+    last_updated: int
+    data: dict
+    translated: dict
+
+    @classmethod
+    def create(cls, ticket_id, data, translated_data, status, priority, assigned_to, date_filed, last_updated=None):
+        category = translated_data.get("category", data.get("category"))
+        sub_category = translated_data.get("sub_category", data.get("sub_category"))
+        return cls(
+            ticket_id, label(Status, status), label(Priority, priority), label(Category, category),
+            sys.intern(sub_category) if sub_category else sub_category, sys.intern(assigned_to),
+            date_filed, date_filed if last_updated is None else last_updated,
+            data, translation_delta(data, translated_data)
+        )
+
+    @property
+    def translated_data(self):
+        """The complaint in English: data with the translated fields overlaid."""
+        if not self.translated:
+            return self.data
+        english = dict(self.data)
+        english.update(self.translated)
+        return english
+
+    def updated(self, **changes):
+        """Return a copy with changes applied. translated_data is accepted and stored as a delta."""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        translated_data = changes.pop("translated_data", None)
+        fields.update(changes)
+        if translated_data is not None:
+            fields["translated"] = translation_delta(fields["data"], translated_data)
+        elif "data" in changes:
+            fields["translated"] = translation_delta(fields["data"], self.translated_data)
+        fields["status"] = label(Status, fields["status"])
+        fields["priority"] = label(Priority, fields["priority"])
+        fields["category"] = label(Category, fields["category"])
+        return Ticket(**fields)
+
+    def pdf_fields(self):
+        """The flat English field map complaint_pdf renders."""
+        fields = dict(self.translated_data)
+        fields.update({
+            "ticket_id": self.ticket_id,
+            "status": str(self.status),
+            "date_filed": format_time(self.date_filed),
+            "assigned_to": self.assigned_to,
+            "priority": str(self.priority)
+        })
+        return fields
+
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def dumps(ticket):
+    """Serialize a ticket to a compact JSON array, e.g. for bulk_export's render processes.
+
+    complaint_store maps tickets to its own columns instead.
+    """
+    return _encode([
+        ticket.ticket_id, str(ticket.status), str(ticket.priority),
+        None if ticket.category is None else str(ticket.category), ticket.sub_category, ticket.assigned_to,
+        ticket.date_filed, ticket.last_updated, ticket.data, ticket.translated
+    ])
+
+
+def loads(text):
+    """Rebuild a Ticket from dumps() output."""
+    ticket_id, status, priority, category, sub_category, assigned_to, date_filed, last_updated, data, translated = json.loads(text)
+    return Ticket(
+        ticket_id, label(Status, status), label(Priority, priority), label(Category, category),
+        sys.intern(sub_category) if sub_category else sub_category, sys.intern(assigned_to),
+        date_filed, last_updated, data, translated
+    )
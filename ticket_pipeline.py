@@ -0,0 +1,130 @@
+"""Background processing of new complaints: evidence, translation, officer assignment and the PDF."""
+import argparse
+import os
+import shutil
+import uuid
+from contextlib import ExitStack
+
+from complaint_store import store, new_ticket, assignment
+from job_queue import JobQueue, DONE, FAILED
+from ticket_model import now
+
+STEPS = ["evidence", "translation", "assignment", "pdf"]
+STEP_LABELS = {
+    "evidence": "Storing evidence",
+    "translation": "Translating to English",
+    "assignment": "Assigning an officer",
+    "pdf": "Preparing the complaint PDF"
+}
+SPOOL_DIR = os.environ.get("CYBERGUARD_SPOOL_DIR", "spool")
+
+queue = JobQueue(os.environ.get("CYBERGUARD_JOBS_DB", "jobs.db"))
+
+
+def spool(fileobj, name):
+    """Copy an upload to the spool directory so a job can process it after the request ends."""
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    path = os.path.join(SPOOL_DIR, uuid.uuid4().hex)
+    fileobj.seek(0)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(fileobj, out, 1024 * 1024)
+    return {"path": path, "name": name}
+
+
+def submit(data, translated_data, source_lang=None, evidence=()):
+    """Store a new ticket, queue its processing and return the ticket ID straight away.
+
+    Pass source_lang to have the job translate data to English (translated_data then only needs
+    the category fields); evidence is a list of spool() results.
+    """
+    ticket = new_ticket(data, translated_data, assign=False)
+    store.save(ticket)
+    queue.enqueue("process_ticket", {"source_lang": source_lang, "evidence": list(evidence)}, ticket_id=ticket.ticket_id)
+    return ticket.ticket_id
+
+
+def _touch(changes):
+    changes["last_updated"] = now()
+    return changes
+
+
+def process_ticket(job):
+    ticket_id = job.ticket_id
+    ticket = store.get(ticket_id)
+    if ticket is None:
+        return
+    payload = job.payload
+
+    if "evidence" not in job.steps_done:
+        if payload["evidence"]:
+            from evidence_store import store as evidence_store
+            with ExitStack() as files:
+                refs = evidence_store.put_many(
+                    (files.enter_context(open(item["path"], "rb")), item["name"]) for item in payload["evidence"]
+                )
+            ticket = store.update(ticket_id, _touch({"data": dict(ticket.data, evidence_files=refs)}))
+        job.step_done("evidence")
+        for item in payload["evidence"]:
+            if os.path.exists(item["path"]):
+                os.remove(item["path"])
+
+    if "translation" not in job.steps_done:
+        if payload["source_lang"]:
+            from translation import translate_batch, untranslated
+            fields = {k: v for k, v in ticket.data.items() if k != "evidence_files"}
+            translated = dict(translate_batch(fields, payload["source_lang"], "English"))
+            missing = untranslated(fields, payload["source_lang"], "English")
+            # translate_batch keeps the original text when the model fails; retry those fields
+            # with the queue's backoff, and only on the last attempt keep them untranslated.
+            if missing and job.attempts < queue.max_attempts:
+                raise RuntimeError(f"Could not translate {', '.join(sorted(missing))} to English")
+            translated.update(ticket.translated)
+            ticket = store.update(ticket_id, _touch({"translated_data": translated}))
+        job.step_done("translation")
+
+    if "assignment" not in job.steps_done:
+        ticket = store.update(ticket_id, _touch(assignment()))
+        job.step_done("assignment")
+
+    if "pdf" not in job.steps_done:
+        import complaint_pdf
+        complaint_pdf.get_pdf(ticket_id, complaint_pdf.ticket_pdf_data(ticket))
+        job.step_done("pdf")
+
+
+queue.register("process_ticket", process_ticket)
+
+
+def progress(ticket_id):
+    """Return {"status", "done", "steps_done", "total", "current", "error"} for a ticket's processing, or None."""
+    jobs = [job for job in queue.jobs_for(ticket_id) if job["kind"] == "process_ticket"]
+    if not jobs:
+        return None
+    job = jobs[-1]
+    pending = [step for step in STEPS if step not in job["steps_done"]]
+    return {
+        "status": job["status"],
+        "done": job["status"] == DONE,
+        "steps_done": len(STEPS) - len(pending),
+        "total": len(STEPS),
+        "current": STEP_LABELS[pending[0]] if pending else None,
+        "error": job["error"] if job["status"] == FAILED else None
+    }
+
+
+# Set CYBERGUARD_JOB_WORKERS=0 and run `python ticket_pipeline.py` to process jobs in a separate process.
+workers = int(os.environ.get("CYBERGUARD_JOB_WORKERS", "2"))
+if workers and __name__ != "__main__":
+    queue.start(workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process queued complaint jobs.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--drain", action="store_true", help="run the jobs that are ready now, then exit")
+    args = parser.parse_args()
+    if args.drain:
+        print(f"Processed {queue.run_pending()} jobs")
+    else:
+        print(f"Processing jobs from {queue.path} with {args.workers} workers")
+        queue.serve(args.workers)
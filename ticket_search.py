@@ -0,0 +1,124 @@
+from ticket_model import format_time
+
+# FTS5 index of each ticket's English and original-language text, with filter columns in ticket_search_rows.
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS ticket_search USING fts5(
+    ticket_id UNINDEXED, narrative, suspect, complainant, original,
+    tokenize = "unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+);
+CREATE TABLE IF NOT EXISTS ticket_search_rows (
+    search_rowid INTEGER PRIMARY KEY,
+    ticket_id TEXT NOT NULL UNIQUE,
+    category TEXT,
+    status TEXT NOT NULL,
+    date_filed TEXT NOT NULL
+);
+"""
+
+COLUMN_FIELDS = {
+    "narrative": ["incident_details", "incident_location", "reason_delay", "incident_datetime",
+                  "state_ut", "district", "police_station", "sub_category"],
+    "suspect": ["suspect_info_type", "suspect_info_value", "suspect_additional_info", "suspect_website_social",
+                "suspect_mobile", "suspect_email", "suspect_bank_account", "suspect_address",
+                "bank_wallet_merchant", "transaction_id"],
+    "complainant": ["name", "phone", "email", "address"]
+}
+# bm25 weights per column (ticket_id first); a match on a suspect identifier is the most specific.
+WEIGHTS = (0.0, 1.0, 2.0, 1.0, 0.8)
+
+
+def _text(value):
+    return value if isinstance(value, str) else ""
+
+
+def document(ticket):
+    """The (narrative, suspect, complainant, original) column values for a ticket."""
+    english = ticket.translated_data
+    columns = [" ".join(filter(None, (_text(english.get(field)) for field in fields))) for fields in COLUMN_FIELDS.values()]
+    columns.append(" ".join(filter(None, (_text(ticket.data.get(field)) for field in ticket.translated))))
+    return columns
+
+
+def filters(ticket):
+    """The (category, status, date_filed) copies kept in ticket_search_rows."""
+    return ticket.category and str(ticket.category), str(ticket.status), format_time(ticket.date_filed)
+
+
+def index_tickets(conn, tickets):
+    """Add new tickets to the index."""
+    for ticket in tickets:
+        rowid = conn.execute(
+            "INSERT INTO ticket_search (ticket_id, narrative, suspect, complainant, original) VALUES (?, ?, ?, ?, ?)",
+            (ticket.ticket_id, *document(ticket))
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO ticket_search_rows (search_rowid, ticket_id, category, status, date_filed) VALUES (?, ?, ?, ?, ?)",
+            (rowid, ticket.ticket_id, *filters(ticket))
+        )
+
+
+def reindex_ticket(conn, ticket):
+    """Replace a ticket's index entry after its text changed."""
+    row = conn.execute("SELECT search_rowid FROM ticket_search_rows WHERE ticket_id = ?", (ticket.ticket_id,)).fetchone()
+    if row is not None:
+        conn.execute("DELETE FROM ticket_search WHERE rowid = ?", row)
+        conn.execute("DELETE FROM ticket_search_rows WHERE search_rowid = ?", row)
+    index_tickets(conn, [ticket])
+
+
+def update_filters(conn, ticket_id, category, status, date_filed):
+    """Refresh the filter copies after a change that left the ticket's text alone."""
+    conn.execute("UPDATE ticket_search_rows SET category = ?, status = ?, date_filed = ? WHERE ticket_id = ?",
+                 (category, status, date_filed, ticket_id))
+
+
+def is_empty(conn):
+    return conn.execute("SELECT 1 FROM ticket_search_rows LIMIT 1").fetchone() is None
+
+
+def rebuild(conn, tickets):
+    """Recreate the index from an iterable of every ticket."""
+    conn.execute("DELETE FROM ticket_search")
+    conn.execute("DELETE FROM ticket_search_rows")
+    index_tickets(conn, tickets)
+
+
+def match_query(text):
+    """Turn free text into an FTS5 query: every word must match; a trailing * makes a word a prefix.
+
+    Each word is quoted, so FTS5 operators and punctuation in the input are taken literally.
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if any(c.isalnum() for c in word):
+            terms.append('"{}"{}'.format(word.replace('"', '""'), "*" if prefix else ""))
+    return " ".join(terms)
+
+
+def search(conn, text, category=None, status=None, date_from=None, date_to=None, limit=20):
+    """Return up to limit [(ticket_id, category, status, date_filed, snippet)] rows, best match first.
+
+    Ranking reads only the index and the narrow rows table; snippets are built for the top limit
+    rows alone, one rowid lookup each.
+    """
+    query = match_query(text)
+    if not query:
+        return []
+    if date_to and len(date_to) == 10:
+        date_to = f"{date_to} 23:59:59"
+    clauses, params = ["ticket_search MATCH ?"], [query]
+    for clause, value in (("r.category = ?", category), ("r.status = ?", status),
+                          ("r.date_filed >= ?", date_from), ("r.date_filed <= ?", date_to)):
+        if value:
+            clauses.append(clause)
+            params.append(value)
+    ranked = conn.execute(
+        f"SELECT r.search_rowid, r.ticket_id, r.category, r.status, r.date_filed "
+        f"FROM ticket_search JOIN ticket_search_rows r ON r.search_rowid = ticket_search.rowid "
+        f"WHERE {' AND '.join(clauses)} ORDER BY bm25(ticket_search, {', '.join(str(w) for w in WEIGHTS)}) LIMIT ?",
+        params + [limit]
+    ).fetchall()
+    snippet = "SELECT snippet(ticket_search, -1, '[', ']', '…', 12) FROM ticket_search WHERE ticket_search MATCH ? AND rowid = ?"
+    return [(*row[1:], conn.execute(snippet, (query, row[0])).fetchone()[0]) for row in ranked]
@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class TieredCache:
+    """Process-wide string cache with an in-memory LRU tier backed by a SQLite file.
+
+    Entries older than `ttl` seconds are treated as missing. The memory tier holds at most
+    `max_memory_entries` items; the disk tier is trimmed to `max_disk_entries` (oldest first)
+    every `EVICT_EVERY` writes. Pass `path=None` to run memory-only.
+    """
+
+    EVICT_EVERY = 256
+
+    def __init__(self, path, table, max_memory_entries=4096, max_disk_entries=200000, ttl=30 * 24 * 3600):
+        self.table = table
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)")
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_created_at ON {table} (created_at)")
+            self._conn.commit()
+
+    def get(self, key):
+        """Return the cached value for key, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._memory[key]
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute(
+                    f"SELECT value, created_at FROM {self.table} WHERE key = ? AND created_at > ?",
+                    (key, now - self.ttl)
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._remember(key, row[0], row[1])
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, value):
+        """Store value under key in both tiers."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._conn is None:
+                return
+            self._conn.execute(f"INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)", (key, value, now))
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict_disk(now)
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the memory tier size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+    def _remember(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now):
+        self._conn.execute(f"DELETE FROM {self.table} WHERE created_at <= ?", (now - self.ttl,))
+        self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
@@ -0,0 +1,137 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from llm import get_client
+from portal_data import languages
+from tiered_cache import TieredCache
+
+# Fields that hold identifiers or options picked from English lists, and never need translating.
+# Amounts and dates are skipped only when purely numeric (NUMERIC_RE): "25 हजार रुपये" is translated.
+NON_TRANSLATABLE_FIELDS = {
+    "phone", "email", "id_number", "transaction_id", "suspect_mobile", "suspect_email", "suspect_bank_account",
+    "category", "sub_category", "id_type"
+}
+NUMERIC_RE = re.compile(r"^[\d\s+\-.,/:()₹$]+$")
+CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+MAX_BATCH_WORKERS = 8
+
+# Shared by every session in this process and persisted across restarts.
+cache = TieredCache(os.environ.get("CYBERGUARD_CACHE_DB", "translation_cache.db"), "translations")
+
+
+def cache_key(text, source_lang, target_lang):
+    """Build the translation cache key for (source_lang, target_lang, text hash)."""
+    return f"{source_lang}:{target_lang}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+def translate_raw(text, source_lang, target_lang):
+    """Translate text with a single model call. Raises on model errors."""
+    prompt = f"Translate this '{source_lang}' text to '{target_lang}' and provide only the translated text: '{text}'"
+    return get_client().generate(prompt)
+
+
+def translate_cached(text, source_lang, target_lang):
+    """Translate text through the shared cache. Raises on model errors."""
+    key = cache_key(text, source_lang, target_lang)
+    translated = cache.get(key)
+    if translated is None:
+        translated = translate_raw(text, source_lang, target_lang)
+        cache.set(key, translated)
+    return translated
+
+
+def needs_translation(field, value, source_lang, target_lang):
+    """Return True if the value has to go through the model."""
+    if not value or source_lang == target_lang:
+        return False
+    return not (field in NON_TRANSLATABLE_FIELDS or NUMERIC_RE.match(value))
+
+
+def _translate_packed(fields, source_lang, target_lang):
+    """Translate several fields in one structured request, or return None if the reply is unusable."""
+    prompt = (
+        f"Translate the values of this JSON object from '{source_lang}' to '{target_lang}'. "
+        "Keep the keys unchanged and reply with only the JSON object: "
+        + json.dumps(fields, ensure_ascii=False)
+    )
+    try:
+        translated = json.loads(CODE_FENCE_RE.sub("", get_client().generate(prompt)))
+    except Exception:
+        return None
+    if not isinstance(translated, dict) or set(translated) != set(fields):
+        return None
+    return {k: str(v).strip() for k, v in translated.items()}
+
+
+def _translate_or_none(text, source_lang, target_lang):
+    try:
+        return translate_raw(text, source_lang, target_lang)
+    except Exception:
+        return None
+
+
+def translate_batch(fields, source_lang, target_lang, max_workers=MAX_BATCH_WORKERS):
+    """Translate a dict of form fields and return a field -> translation map for all non-empty fields.
+
+    Identifiers, fixed options and purely numeric values are passed through, and cached
+    translations are reused. The rest is sent as one structured request; if the reply can't be
+    parsed the fields are translated concurrently on a bounded thread pool instead. Fields that
+    fail keep their original text.
+    """
+    result = {k: v for k, v in fields.items() if v}
+    pending = {}
+    for k, v in result.items():
+        if needs_translation(k, v, source_lang, target_lang):
+            cached = cache.get(cache_key(v, source_lang, target_lang))
+            if cached is None:
+                pending[k] = v
+            else:
+                result[k] = cached
+    if not pending:
+        return result
+
+    translated = _translate_packed(pending, source_lang, target_lang) if len(pending) > 1 else None
+    if translated is None:
+        keys = list(pending)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as pool:
+            values = pool.map(lambda k: _translate_or_none(pending[k], source_lang, target_lang), keys)
+            translated = {k: v for k, v in zip(keys, values) if v is not None}
+    for k, v in translated.items():
+        cache.set(cache_key(pending[k], source_lang, target_lang), v)
+    result.update(translated)
+    return result
+
+
+def untranslated(fields, source_lang, target_lang):
+    """The keys of fields that need translating but have no cached translation.
+
+    After translate_batch these are the fields that failed and kept their original text.
+    """
+    return {k for k, v in fields.items()
+            if needs_translation(k, v, source_lang, target_lang) and cache.get(cache_key(v, source_lang, target_lang)) is None}
+
+
+def warm_up(target_languages=None):
+    """Pre-translate the complaint form's questions, labels and notices into the given (default: all) languages."""
+    from form_schema import form_texts
+    texts = form_texts()
+    for lang in target_languages or languages:
+        if lang == "English":
+            continue
+        translate_batch(texts, "English", lang)
+        missing = len(untranslated(texts, "English", lang))
+        print(f"{lang}: {len(texts) - missing}/{len(texts)} form texts cached")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the shared translation cache.")
+    parser.add_argument("--warm", action="store_true", help="pre-translate the complaint form texts")
+    parser.add_argument("--languages", nargs="*", help="limit warm-up to these languages")
+    args = parser.parse_args()
+    if args.warm:
+        warm_up(args.languages)
+    print(cache.stats())